@@ -12,44 +12,39 @@ Full enumeration of all partitions
 
 import numpy as np
 import networkx as nx
-from typing import List, Tuple, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Dict, Optional
 from ce2_core import (
     generate_all_partitions,
-    coarse_grain_tpm,
-    calculate_cp
+    iter_partition_labels,
+    calculate_cp_labels,
+    block_row_sums
+)
+from compact_partition import CompactPartition
+from incremental_cp import calculate_cp_labels_incremental
+from lattice_cache import load_lattice
+from partition_lattice import (
+    build_hasse_diagram,
+    build_hasse_csr,
+    hasse_csr_to_graph,
+    partitions_to_label_array,
+    calculate_delta_cp_lattice
 )
 
 def build_refinement_graph(partitions: List[Tuple[Tuple[int, ...], ...]]) -> nx.DiGraph:
     """
     Build Hasse diagram (refinement lattice).
-    Edge from πa to πb if πa refines πb (πa ≤ πb).
+    Edge from πa to πb if πb covers πa (πb merges two blocks of πa).
     """
-    G = nx.DiGraph()
-    
-    for p in partitions:
-        G.add_node(p)
-    
-    # Check refinement relation
-    for i, pa in enumerate(partitions):
-        for j, pb in enumerate(partitions):
-            if i == j:
-                continue
-            # Check if pa ≤ pb (pa refines pb)
-            if is_refinement(pa, pb):
-                G.add_edge(pa, pb)
-    
-    # Transitive reduction to get Hasse diagram
-    G = nx.transitive_reduction(G)
-    
-    return G
+    return build_hasse_diagram(partitions)
 
 def is_refinement(pa: Tuple, pb: Tuple) -> bool:
     """
-    Check if pa refines pb: ∀b ∈ pb : ∃a ∈ pa s.t. a ⊆ b
+    Check if pa refines pb: ∀a ∈ pa : ∃b ∈ pb s.t. a ⊆ b
     """
-    for block_b in pb:
+    for block_a in pa:
         found = False
-        for block_a in pa:
+        for block_b in pb:
             if set(block_a).issubset(set(block_b)):
                 found = True
                 break
@@ -65,23 +60,64 @@ def calculate_delta_cp(
 ) -> Dict[Tuple, float]:
     """
     Calculate ΔCP for each partition relative to its ancestors.
+    Single topological sweep over the covering edges of G
+    (see partition_lattice.calculate_delta_cp_lattice).
     """
-    delta_cp_dict = {}
+    index = {p: idx for idx, p in enumerate(partitions)}
+    targets = [[index[q] for q in G.successors(p)] for p in partitions]
+    indptr = np.zeros(len(partitions) + 1, dtype=np.int64)
+    np.cumsum([len(t) for t in targets], out=indptr[1:])
+    indices = np.array([t for ts in targets for t in ts], dtype=np.int64)
     
-    for p in partitions:
-        # Get all ancestors (all nodes reachable from p going backwards)
-        ancestors = list(nx.ancestors(G, p))
-        
-        if len(ancestors) == 0:
-            baseline = 0.0
-        else:
-            baseline = max([cp_dict[a] for a in ancestors])
-        
-        delta_cp_dict[p] = cp_dict[p] - baseline
+    cp = np.array([cp_dict[p] for p in partitions])
+    block_counts = np.array([len(p) for p in partitions])
+    delta_cp = calculate_delta_cp_lattice(cp, indptr, indices, block_counts)
     
-    return delta_cp_dict
+    return dict(zip(partitions, delta_cp.tolist()))
+
+# Micro TPM (and its block-row cache) of the current worker process, set
+# once by the pool initializer
+_worker_tpm = None
+_worker_block_rows = None
+
+def _init_cp_worker(T: np.ndarray, block_cache: bool = False):
+    global _worker_tpm, _worker_block_rows
+    _worker_tpm = T
+    _worker_block_rows = block_row_sums(T) if block_cache else None
+
+def _score_label_shard(labels: np.ndarray) -> np.ndarray:
+    return calculate_cp_labels(_worker_tpm, labels, _worker_block_rows)
 
-def run_algorithm1(T: np.ndarray, epsilon: float = 1e-10) -> Dict:
+def calculate_cp_parallel(
+    T: np.ndarray,
+    labels: np.ndarray,
+    workers: int,
+    shard_size: int = 8192,
+    block_cache: bool = False
+) -> np.ndarray:
+    """
+    Score (P, n) label vectors across a process pool.
+    T is sent once per worker; shards are uint8 label arrays and results
+    are concatenated in shard order, so the output is bit-identical to
+    calculate_cp_labels(T, labels).
+    block_cache: each worker builds block_row_sums(T) once
+    """
+    shards = [labels[start:start + shard_size] for start in range(0, len(labels), shard_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_cp_worker, initargs=(T, block_cache)) as pool:
+        cp_shards = list(pool.map(_score_label_shard, shards))
+    return np.concatenate(cp_shards) if cp_shards else np.zeros(0)
+
+def run_algorithm1(
+    T: np.ndarray,
+    epsilon: float = 1e-10,
+    record_best_ancestor: bool = False,
+    workers: Optional[int] = None,
+    compact: bool = False,
+    use_lattice_cache: bool = False,
+    build_graph: bool = True,
+    block_cache: bool = False,
+    incremental: bool = False
+) -> Dict:
     """
     Run Algorithm 1: Full brute force calculation of emergent hierarchy.
     
@@ -91,38 +127,85 @@ def run_algorithm1(T: np.ndarray, epsilon: float = 1e-10) -> Dict:
         - delta_cp_dict: ΔCP values
         - emergent: partitions with ΔCP > epsilon
         - graph: refinement graph
+        - best_ancestor_dict: refinement with the largest CP for each
+          partition (None for the microscale), if record_best_ancestor
+    
+    workers: score CP in a process pool of this size (None or 1: serial)
+    compact: key results by CompactPartition (RGS order) instead of
+        tuple-of-tuples partitions (sorted order)
+    use_lattice_cache: map partitions and the Hasse diagram from the
+        on-disk lattice cache (built on first use; sorted order)
+    build_graph: build the networkx refinement graph (otherwise 'graph'
+        is None; ΔCP only needs the CSR covers)
+    block_cache: coarse-grain from the summed micro rows of every block,
+        precomputed once by bitmask (ce2_core.block_row_sums, n <= 20)
+    incremental: score CP in one serial pass over partitions grouped by
+        their (n-1)-prefix (incremental_cp, n <= 16); cannot be combined
+        with workers > 1 (ValueError)
     """
+    if incremental and workers is not None and workers > 1:
+        raise ValueError("incremental scoring is serial; use either incremental=True or workers > 1")
     n = T.shape[0]
     print(f"Starting Algorithm 1 for n={n} states...")
     
     # Step 1: Generate all partitions
     print("Step 1: Generating all partitions...")
-    partitions = generate_all_partitions(n)
+    lattice = None
+    if use_lattice_cache:
+        lattice = load_lattice(n)
+        labels = lattice['labels']
+        partitions = [CompactPartition(row.tobytes()) for row in labels]
+        if not compact:
+            partitions = [p.to_tuple() for p in partitions]
+    elif compact:
+        labels = np.concatenate(list(iter_partition_labels(n)))
+        partitions = [CompactPartition(row.tobytes()) for row in labels]
+    else:
+        partitions = generate_all_partitions(n)
+        labels = partitions_to_label_array(partitions)
     print(f"  Generated {len(partitions)} partitions (Bell number B({n}))")
     
     # Step 2: Compute CP for each partition
     print("Step 2: Computing CP for all partitions...")
-    cp_dict = {}
-    for p in partitions:
-        T_coarse = coarse_grain_tpm(T, p)
-        cp_dict[p] = calculate_cp(T_coarse)
+    if incremental:
+        cp_values = calculate_cp_labels_incremental(T, labels)
+    elif workers is not None and workers > 1:
+        cp_values = calculate_cp_parallel(T, labels, workers, block_cache=block_cache)
+    else:
+        block_rows = block_row_sums(T) if block_cache else None
+        cp_values = calculate_cp_labels(T, labels, block_rows)
+    cp_dict = dict(zip(partitions, cp_values.tolist()))
     print(f"  Computed CP for {len(cp_dict)} partitions")
     
     # Step 3: Build refinement graph
     print("Step 3: Building refinement lattice...")
-    G = build_refinement_graph(partitions)
-    print(f"  Built graph with {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
+    if lattice is not None:
+        indptr, indices = lattice['indptr'], lattice['indices']
+    else:
+        indptr, indices = build_hasse_csr(labels)
+    if build_graph:
+        G = hasse_csr_to_graph(partitions, indptr, indices)
+    else:
+        G = None
+    print(f"  Built lattice with {len(partitions)} nodes, {len(indices)} edges")
     
     # Step 4: Calculate ΔCP
     print("Step 4: Computing ΔCP relative to ancestors...")
-    delta_cp_dict = calculate_delta_cp(T, partitions, cp_dict, G)
+    block_counts = labels.max(axis=1).astype(np.intp) + 1
+    if record_best_ancestor:
+        delta_cp, best_ancestor = calculate_delta_cp_lattice(
+            cp_values, indptr, indices, block_counts, return_best_ancestor=True
+        )
+    else:
+        delta_cp = calculate_delta_cp_lattice(cp_values, indptr, indices, block_counts)
+    delta_cp_dict = dict(zip(partitions, delta_cp.tolist()))
     
     # Step 5: Emergent set
     print("Step 5: Extracting emergent hierarchy...")
     emergent = [p for p in partitions if delta_cp_dict[p] > epsilon]
     print(f"  Found {len(emergent)} emergent scales (ΔCP > {epsilon})")
     
-    return {
+    results = {
         'partitions': partitions,
         'cp_dict': cp_dict,
         'delta_cp_dict': delta_cp_dict,
@@ -130,4 +213,10 @@ def run_algorithm1(T: np.ndarray, epsilon: float = 1e-10) -> Dict:
         'graph': G,
         'n': n
     }
-
+    if record_best_ancestor:
+        results['best_ancestor_dict'] = {
+            p: partitions[a] if a >= 0 else None
+            for p, a in zip(partitions, best_ancestor.tolist())
+        }
+    
+    return results
@@ -11,120 +11,222 @@ Algorithm 2 & 3: Branching Greedy (corrected)
 """
 import numpy as np
 from itertools import combinations
-from ce2_core import calculate_cp, coarse_grain_tpm
+from concurrent.futures import ProcessPoolExecutor
+from ce2_core import (
+    calculate_cp,
+    coarse_grain_tpm,
+    block_weights,
+    calculate_merge_cp,
+    merge_macro_tpm,
+    merge_partition_blocks
+)
+from partition_lattice import RefinementIndex
+from cp_cache import CPCache, merge_cache_stats
+from compact_partition import CompactPartition
 
-def greedy_completion(tpm, start_partition):
-    """Algorithm 2: GreedyCompletion"""
+# CP values equal up to this many decimals are treated as ties, so that
+# the first candidate in merge order wins regardless of rounding noise
+CP_TIE_DECIMALS = 12
+
+def rank_merges(merge_cps):
+    """Merge indices ordered by decreasing CP, ties kept in merge order"""
+    return np.argsort(-np.round(merge_cps, CP_TIE_DECIMALS), kind='stable')
+
+def greedy_completion(tpm, start_partition, memo=None):
+    """
+    Algorithm 2: GreedyCompletion
+    
+    memo: optional CPCache shared between calls, holding (cp, successor)
+    per partition; successor is the next partition on the greedy path, or
+    None if not known yet. The greedy step from a partition is deterministic,
+    so once a path reaches a partition with a known successor the rest of it
+    is read from the memo.
+    """
+    if memo is None:
+        memo = CPCache(maxsize=None)
+    
     current = start_partition
-    path = [current]
-    cp_list = [calculate_cp(coarse_grain_tpm(tpm, current))]
+    path = []
+    cp_list = []
+    tpm_macro = None
     
-    while len(current) > 1:
-        k = len(current)
-        best_cp = -np.inf
-        best_partition = None
-        
-        for i, j in combinations(range(k), 2):
-            new_partition = []
-            merged_block = tuple(sorted(current[i] + current[j]))
-            
-            for idx in range(k):
-                if idx == i:
-                    new_partition.append(merged_block)
-                elif idx != j:
-                    new_partition.append(current[idx])
-            
-            new_partition = tuple(sorted(new_partition, key=lambda x: x[0]))
-            
-            tpm_coarse = coarse_grain_tpm(tpm, new_partition)
-            cp = calculate_cp(tpm_coarse)
+    while current is not None:
+        cached_cp, successor = memo.get(current, (None, None))
+        if successor is not None or (cached_cp is not None and len(current) == 1):
+            cp = cached_cp
+            tpm_macro = None
+        else:
+            if tpm_macro is None:
+                tpm_macro = coarse_grain_tpm(tpm, current)
+                weights = block_weights(tpm, current)
+                cp = cached_cp if cached_cp is not None else calculate_cp(tpm_macro)
             
-            if cp > best_cp:
-                best_cp = cp
-                best_partition = new_partition
+            if len(current) > 1:
+                # Score every merge of two blocks incrementally from the parent
+                merge_cps = calculate_merge_cp(tpm_macro, weights)
+                best = rank_merges(merge_cps)[0]
+                i, j = list(combinations(range(len(current)), 2))[best]
+                successor = merge_partition_blocks(current, i, j)
+                tpm_macro, weights = merge_macro_tpm(tpm_macro, weights, i, j)
+            memo.put(current, (cp, successor))
         
-        current = best_partition
         path.append(current)
-        cp_list.append(best_cp)
+        cp_list.append(cp)
+        if successor is not None and tpm_macro is not None:
+            cp = float(merge_cps[best])
+        current = successor
     
     return path, cp_list
 
-def run_greedy_algorithm(tpm, n_paths=100, verbose=True):
-    """Algorithm 3: Branching Greedy with parallel paths"""
+# Micro TPM and memo size of the current worker process, set once by the
+# pool initializer
+_worker_tpm = None
+_worker_cache_size = None
+
+def _init_greedy_worker(tpm, cache_size):
+    global _worker_tpm, _worker_cache_size
+    _worker_tpm = tpm
+    _worker_cache_size = cache_size
+
+def _run_greedy_paths(start_partitions):
+    """Greedy completions of a chunk of starts sharing one local memo"""
+    memo = CPCache(_worker_cache_size)
+    paths = [greedy_completion(_worker_tpm, start, memo) for start in start_partitions]
+    return paths, memo.stats()
+
+def run_greedy_paths(tpm, start_partitions, workers=None, memo=None, cache_size=100_000):
+    """
+    Run greedy_completion from each start partition, in order.
+    Serially all paths share memo (a CPCache). With workers > 1 the starts
+    are split into contiguous chunks over a process pool and each worker
+    keeps its own CPCache(cache_size).
+    
+    Returns: (list of (path, cp_list), cache statistics)
+    """
+    if workers is None or workers <= 1:
+        if memo is None:
+            memo = CPCache(cache_size)
+        paths = [greedy_completion(tpm, start, memo) for start in start_partitions]
+        return paths, memo.stats()
+    
+    n_chunks = min(workers, len(start_partitions))
+    bounds = np.linspace(0, len(start_partitions), n_chunks + 1).astype(int)
+    chunks = [start_partitions[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_greedy_worker,
+                             initargs=(tpm, cache_size)) as pool:
+        chunk_results = list(pool.map(_run_greedy_paths, chunks))
+    paths = [result for chunk, _ in chunk_results for result in chunk]
+    return paths, merge_cache_stats([stats for _, stats in chunk_results])
+
+def run_greedy_algorithm(tpm, n_paths=100, verbose=True, workers=None, cache_size=100_000,
+                         compact=False, seeds=None):
+    """
+    Algorithm 3: Branching Greedy with parallel paths
+    
+    workers: run the greedy completions in a process pool of this size
+    (None or 1: serial). The sampled set is the same either way.
+    cache_size: capacity of the LRU CP/successor memo (per worker)
+    compact: sample CompactPartition keys instead of tuple-of-tuples
+    seeds: extra start partitions (e.g. lumpability.find_lumpable_partitions),
+    each scored exactly and completed greedily after the branching paths
+    """
     n = tpm.shape[0]
     
     if verbose:
         print(f"Starting Branching Greedy for n={n} states...")
         print(f"Number of parallel paths: {n_paths}")
     
-    microscale = tuple((i,) for i in range(n))
-    cp_dict = {microscale: calculate_cp(tpm)}
+    if compact:
+        microscale = CompactPartition.microscale(n)
+    else:
+        microscale = tuple((i,) for i in range(n))
+    memo = CPCache(cache_size)
     
+    # Walk the branching spine first: per level, all scored merges and the
+    # starting partitions of the greedy paths branching off it
+    levels = []
     current = microscale
+    tpm_macro = coarse_grain_tpm(tpm, current)
+    weights = block_weights(tpm, current)
+    cp_current = calculate_cp(tpm_macro)
     path_count = 0
     
     while len(current) > 1:
-        k = len(current)
+        pairs = list(combinations(range(len(current)), 2))
+        merge_cps = calculate_merge_cp(tpm_macro, weights)
         candidates = []
+        for (i, j), cp in zip(pairs, merge_cps.tolist()):
+            new_partition = merge_partition_blocks(current, i, j)
+            # Earlier scores (and known successors) take precedence
+            cached_cp, _ = memo.get(new_partition, (None, None))
+            if cached_cp is None:
+                memo.put(new_partition, (cp, None))
+            candidates.append((new_partition, cp if cached_cp is None else cached_cp))
         
-        for i, j in combinations(range(k), 2):
-            new_partition = []
-            merged_block = tuple(sorted(current[i] + current[j]))
-            
-            for idx in range(k):
-                if idx == i:
-                    new_partition.append(merged_block)
-                elif idx != j:
-                    new_partition.append(current[idx])
-            
-            new_partition = tuple(sorted(new_partition, key=lambda x: x[0]))
-            
-            tpm_coarse = coarse_grain_tpm(tpm, new_partition)
-            cp = calculate_cp(tpm_coarse)
-            
-            candidates.append((cp, new_partition))
-            
-            if new_partition not in cp_dict:
-                cp_dict[new_partition] = cp
+        order = rank_merges(merge_cps)
+        top_n = min(n_paths, len(order))
+        selected = [pairs[idx] for idx in order[:top_n]]
         
-        candidates.sort(reverse=True, key=lambda x: x[0])
-        top_n = min(n_paths, len(candidates))
-        selected = [c[1] for c in candidates[:top_n]]
+        n_starts = max(0, min(len(selected), n_paths - path_count))
+        starts = [candidates[idx][0] for idx in order[:n_starts]]
+        path_count += n_starts
+        levels.append((candidates, starts))
         
-        for start_partition in selected:
-            if path_count >= n_paths:
-                break
-                
-            path, cp_list = greedy_completion(tpm, start_partition)
-            path_count += 1
-            
+        # The spine step is the greedy step from current
+        i, j = selected[0]
+        successor = merge_partition_blocks(current, i, j)
+        memo.put(current, (cp_current, successor))
+        current = successor
+        cp_current = candidates[order[0]][1]
+        tpm_macro, weights = merge_macro_tpm(tpm_macro, weights, i, j)
+    
+    seed_starts = []
+    for seed in seeds or []:
+        if compact:
+            seed_starts.append(seed if isinstance(seed, CompactPartition)
+                               else CompactPartition.from_tuple(seed))
+        else:
+            seed_starts.append(tuple(sorted((tuple(sorted(block)) for block in seed),
+                                            key=lambda block: block[0])))
+    
+    all_starts = [start for _, starts in levels for start in starts] + seed_starts
+    path_results, cache_stats = run_greedy_paths(
+        tpm, all_starts, workers, memo=memo, cache_size=cache_size
+    )
+    paths = iter(path_results)
+    
+    # Record scores in spine order: level candidates, then that level's paths
+    cp_dict = {microscale: calculate_cp(tpm)}
+    for candidates, starts in levels:
+        for partition, cp in candidates:
+            if partition not in cp_dict:
+                cp_dict[partition] = cp
+        
+        for _ in starts:
+            path, cp_list = next(paths)
             for partition, cp in zip(path, cp_list):
                 if partition not in cp_dict:
                     cp_dict[partition] = cp
         
-        current = selected[0] if selected else current
-        
-        if verbose and len(current) % 2 == 0:
-            print(f"  Progress: dimensionality {len(current)}, sampled {len(cp_dict)} partitions")
+        dim = len(candidates[0][0]) if candidates else 1
+        if verbose and dim % 2 == 0:
+            print(f"  Progress: dimensionality {dim}, sampled {len(cp_dict)} partitions")
+    
+    for _ in seed_starts:
+        path, cp_list = next(paths)
+        for partition, cp in zip(path, cp_list):
+            if partition not in cp_dict:
+                cp_dict[partition] = cp
     
     if verbose:
         print(f"Completed: {len(cp_dict)} unique partitions sampled")
     
-    # Corrected ΔCP calculation
-    delta_cp_dict = {}
-    
-    for partition in cp_dict.keys():
-        max_ancestor_cp = 0.0
-        
-        for other in cp_dict.keys():
-            # Exclude self!
-            if other == partition:
-                continue
-                
-            if is_refinement(partition, other):
-                max_ancestor_cp = max(max_ancestor_cp, cp_dict[other])
-        
-        delta_cp_dict[partition] = cp_dict[partition] - max_ancestor_cp
+    # Corrected ΔCP calculation: max CP over sampled strict refinements
+    refinement_index = RefinementIndex(cp_dict)
+    delta_cp_dict = {
+        partition: cp - max(0.0, refinement_index.max_refinement_cp(partition))
+        for partition, cp in cp_dict.items()
+    }
     
     threshold = 1e-10
     emergent = [p for p in cp_dict.keys() if delta_cp_dict[p] > threshold]
@@ -136,7 +238,9 @@ def run_greedy_algorithm(tpm, n_paths=100, verbose=True):
         'cp_dict': cp_dict,
         'delta_cp_dict': delta_cp_dict,
         'emergent': emergent,
-        'n_sampled': len(cp_dict)
+        'n_sampled': len(cp_dict),
+        'refinement_index': refinement_index,
+        'cache_stats': cache_stats
     }
 
 def is_refinement(partition_a, partition_b):
@@ -7,8 +7,17 @@ Developer: SubstanceNet
 
 #!/usr/bin/env python3
 """
-10-state system analysis via BRANCHING GREEDY
-(brute force NOT suitable for n>=10)
+10-state system analysis, via BRANCHING GREEDY by default (the archived
+results). beam is a second heuristic; brute_force (all 115,975 partitions,
+from the lattice cache) and symmetric (one partition per orbit) are exact
+over the whole lattice. decomposed is exact only over the 2,704 partitions
+whose blocks stay within one cycle: partitions with blocks across the two
+cycles are excluded.
+
+Usage: python analyze_10state_two_5cycles.py [greedy|beam|brute_force|symmetric|decomposed]
+
+Greedy writes results/results_10state_two_5cycles.pkl; the other modes
+write results/results_10state_two_5cycles_<algorithm>.pkl.
 """
 import sys
 import pickle
@@ -17,14 +26,34 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 from ce2_core import calculate_cp, calculate_determinism, calculate_degeneracy, coarse_grain_tpm
+from algorithm1_brute_force import run_algorithm1
 from algorithm2_greedy import run_greedy_algorithm
+from beam_search import run_beam_search
+from symmetry import run_symmetric_algorithm1, expand_symmetric_results
+from decomposition import run_decomposed_algorithm1
 
 sys.path.insert(0, str(Path(__file__).parent.parent / 'data'))
 from ten_state_two_five_cycles import create_two_five_cycle_tpm, get_optimal_partition
 
-def main():
+# Search algorithms with a common result schema (cp_dict, delta_cp_dict, emergent)
+ALGORITHMS = {
+    'greedy': ("Branching Greedy Algorithm (n_paths=100)",
+               lambda tpm: run_greedy_algorithm(tpm, n_paths=100)),
+    'beam': ("Beam Search (beam_width=10)",
+             lambda tpm: run_beam_search(tpm, beam_width=10)),
+    'brute_force': ("Algorithm 1 (all partitions)",
+                    lambda tpm: run_algorithm1(tpm, use_lattice_cache=True, build_graph=False)),
+    'symmetric': ("Algorithm 1 over orbits of the TPM automorphisms",
+                  lambda tpm: expand_symmetric_results(run_symmetric_algorithm1(tpm))),
+    'decomposed': ("Algorithm 1 over partitions within the two cycles (cross-cycle blocks excluded)",
+                   lambda tpm: run_decomposed_algorithm1(tpm))
+}
+
+def main(algorithm='greedy'):
+    name, search = ALGORITHMS[algorithm]
+    
     print("\n" + "="*70)
-    print("ANALYSIS: 10-state Two 5-Cycles (BRANCHING GREEDY)")
+    print(f"ANALYSIS: 10-state Two 5-Cycles ({algorithm.upper()})")
     print("="*70)
     
     p_self = 0.20
@@ -51,16 +80,15 @@ def main():
     print(f"  CP(macro) = {cp_macro:.4f}")
     print(f"  ΔCP       = {delta_cp:.4f}")
     
-    # Greedy algorithm
+    # Search
     print("\n" + "-"*70)
-    print("Running Branching Greedy Algorithm (n_paths=100)...")
+    print(f"Running {name}...")
     print("-"*70)
     
-    results = run_greedy_algorithm(tpm, n_paths=100)
+    results = search(tpm)
     
-    # Exclude microscale
-    microscale = tuple((i,) for i in range(10))
-    emergent = [p for p in results['emergent'] if p != microscale]
+    # Exclude microscale (the only partition with 10 blocks)
+    emergent = [p for p in results['emergent'] if len(p) < 10]
     
     print("\n" + "="*70)
     print("RESULTS:")
@@ -97,11 +125,13 @@ def main():
         'n_emergent': len(emergent),
         'emergent_partitions': emergent,
         'hierarchy_type': 'Balloon' if len(emergent) == 1 else 'Complex',
-        'n_partitions_sampled': len(results['cp_dict'])
+        'n_partitions_sampled': len(results['cp_dict']),
+        'algorithm': algorithm
     }
     
-    # Save results
-    output_file = Path("results/results_10state_two_5cycles.pkl")
+    # Save results (only greedy replaces the archived file)
+    suffix = "" if algorithm == 'greedy' else f"_{algorithm}"
+    output_file = Path(f"results/results_10state_two_5cycles{suffix}.pkl")
     with open(output_file, 'wb') as f:
         pickle.dump(output_data, f)
     
@@ -118,4 +148,4 @@ def main():
     print("="*70 + "\n")
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1] if len(sys.argv) > 1 else 'greedy')
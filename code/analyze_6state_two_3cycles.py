@@ -18,12 +18,17 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 from ce2_core import calculate_cp, calculate_determinism, calculate_degeneracy, coarse_grain_tpm
 from algorithm1_brute_force import run_algorithm1
+from result_store import save_sweep_results
+from parameter_sweep import run_parameter_sweep, emergent_partitions
 
 sys.path.insert(0, str(Path(__file__).parent.parent / 'data'))
 from six_state_two_cycle import create_two_cycle_tpm
 
-def analyze_single_p_self(p_self):
-    """Analyzes 6-state system for given p_self"""
+def analyze_single_p_self(p_self, emergent=None):
+    """
+    Analyzes 6-state system for given p_self.
+    emergent: Algorithm 1 emergent partitions from a batched sweep (run if None)
+    """
     # Create TPM
     tpm = create_two_cycle_tpm(p_self=p_self)
     
@@ -42,11 +47,11 @@ def analyze_single_p_self(p_self):
     delta_cp = cp_macro - cp_micro
     
     # Algorithm 1 with correct microscale exclusion
-    algo_results = run_algorithm1(tpm)
+    if emergent is None:
+        emergent = run_algorithm1(tpm, use_lattice_cache=True, build_graph=False)['emergent']
     
-    # EXCLUDE MICROSCALE!
-    microscale = tuple((i,) for i in range(6))
-    emergent_corrected = [p for p in algo_results['emergent'] if p != microscale]
+    # EXCLUDE MICROSCALE! (the only partition with 6 blocks)
+    emergent_corrected = [p for p in emergent if len(p) < 6]
     n_emergent_corrected = len(emergent_corrected)
     
     return {
@@ -58,7 +63,7 @@ def analyze_single_p_self(p_self):
         'det_macro': det_macro,
         'deg_macro': deg_macro,
         'delta_cp': delta_cp,
-        'n_emergent_raw': len(algo_results['emergent']),
+        'n_emergent_raw': len(emergent),
         'n_emergent_corrected': n_emergent_corrected,
         'emergent_partitions': emergent_corrected
     }
@@ -70,11 +75,14 @@ def main():
     print("="*70)
     
     p_self_values = np.arange(0.0, 0.55, 0.05)
+    
+    # Algorithm 1 for all p_self values in one batched pass
+    sweep = run_parameter_sweep(lambda p: create_two_cycle_tpm(p_self=p), p_self_values)
     all_results = []
     
-    for p_self in p_self_values:
+    for g, p_self in enumerate(p_self_values):
         print(f"\nAnalyzing p_self = {p_self:.2f}...")
-        results = analyze_single_p_self(p_self)
+        results = analyze_single_p_self(p_self, emergent=emergent_partitions(sweep, g))
         all_results.append(results)
         
         print(f"  CP(micro)={results['cp_micro']:.4f} | "
@@ -88,8 +96,13 @@ def main():
     with open(output_file, 'wb') as f:
         pickle.dump(all_results, f)
     
+    # Columnar copy for plotting scripts (loads single columns)
+    store_dir = save_sweep_results(output_file.with_suffix(''), all_results,
+                                   {'system': '6-state two 3-cycles', 'parameter': 'p_self'})
+    
     print(f"\n{'='*70}")
     print(f"Saved: {output_file}")
+    print(f"Column store: {store_dir}")
     print(f"Total configurations: {len(all_results)}")
     print(f"{'='*70}\n")
     
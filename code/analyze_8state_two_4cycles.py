@@ -25,6 +25,8 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from ce2_core import calculate_cp, calculate_determinism, calculate_degeneracy, coarse_grain_tpm
 from algorithm1_brute_force import run_algorithm1
+from result_store import save_sweep_results
+from parameter_sweep import run_parameter_sweep, emergent_partitions
 
 def create_two_cycle_tpm(n_states=8, p_self=0.2):
     """
@@ -65,10 +67,16 @@ def create_two_cycle_tpm(n_states=8, p_self=0.2):
     
     return tpm
 
-def analyze_single_p_self(p_self, verbose=True):
+def analyze_single_p_self(p_self, verbose=True, emergent=None):
     """
     Analyzes system for given p_self.
     
+    Parameters:
+    -----------
+    emergent : list, optional
+        Emergent partitions from a batched sweep (see parameter_sweep);
+        Algorithm 1 is run when omitted
+    
     Returns:
     --------
     results : dict
@@ -93,12 +101,11 @@ def analyze_single_p_self(p_self, verbose=True):
         print(f"p_self = {p_self:.2f}")
         print(f"{'='*60}")
     
-    algo_results = run_algorithm1(tpm)
+    if emergent is None:
+        emergent = run_algorithm1(tpm, use_lattice_cache=True, build_graph=False)['emergent']
     
-    # Exclude microscale from emergent scales
-    microscale = tuple((i,) for i in range(8))
-    emergent_corrected = [p for p in algo_results['emergent'] 
-                         if p != microscale]
+    # Exclude microscale (the only partition with 8 blocks) from emergent scales
+    emergent_corrected = [p for p in emergent if len(p) < 8]
     n_emergent_corrected = len(emergent_corrected)
     
     results = {
@@ -110,7 +117,7 @@ def analyze_single_p_self(p_self, verbose=True):
         'det_macro': det_macro,
         'deg_macro': deg_macro,
         'delta_cp': delta_cp,
-        'n_emergent': len(algo_results['emergent']),
+        'n_emergent': len(emergent),
         'n_emergent_corrected': n_emergent_corrected,
         'emergent_partitions': emergent_corrected,
         'tpm': tpm,
@@ -143,10 +150,14 @@ def run_sensitivity_analysis():
     # Range of p_self values
     p_self_values = np.arange(0.0, 0.55, 0.05)
     
+    # Algorithm 1 for all p_self values in one batched pass
+    sweep = run_parameter_sweep(lambda p: create_two_cycle_tpm(n_states=8, p_self=p), p_self_values)
+    
     all_results = []
     
-    for p_self in p_self_values:
-        results = analyze_single_p_self(p_self, verbose=False)
+    for g, p_self in enumerate(p_self_values):
+        results = analyze_single_p_self(p_self, verbose=False,
+                                        emergent=emergent_partitions(sweep, g))
         all_results.append(results)
         
         # Short output
@@ -164,8 +175,13 @@ def run_sensitivity_analysis():
     with open(output_file, 'wb') as f:
         pickle.dump(all_results, f)
     
+    # Columnar copy for plotting scripts (loads single columns)
+    store_dir = save_sweep_results(output_dir / "sensitivity_analysis_8state", all_results,
+                                   {'system': '8-state two 4-cycles', 'parameter': 'p_self'})
+    
     print(f"\n{'='*70}")
     print(f"Results saved: {output_file}")
+    print(f"Column store:  {store_dir}")
     print(f"Total configurations analyzed: {len(all_results)}")
     print(f"{'='*70}")
     
@@ -0,0 +1,117 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+Beam search over the partition lattice
+
+Starting from the microscale, every level merges two blocks of each of the
+best beam_width partitions found so far. Children are deduplicated by their
+restricted growth string and scored in one batch per level; the beam width
+trades sampled partitions (and time) against coverage, between the single
+greedy path (beam_width=1) and Algorithm 1.
+"""
+
+import numpy as np
+from ce2_core import calculate_cp, calculate_cp_labels, labels_to_partition
+from partition_lattice import merge_labels, RefinementIndex
+from compact_partition import CompactPartition
+from algorithm2_greedy import rank_merges
+
+def merge_children(labels):
+    """
+    All single-merge children of a (B, n) stack of k-block restricted growth
+    strings, parent-major and pairs in itertools.combinations order.
+    Returns: (B·k(k-1)/2, n) restricted growth strings
+    """
+    B, n = labels.shape
+    k = int(labels.max()) + 1
+    a, b = np.triu_indices(k, 1)
+    children = merge_labels(labels[:, None, :], a[None, :, None], b[None, :, None])
+    return children.reshape(-1, n)
+
+def run_beam_search(tpm, beam_width=10, verbose=True, compact=False):
+    """
+    Beam search with width beam_width.
+    
+    Every scored partition is recorded in cp_dict, level by level; ΔCP is
+    taken over the sampled strict refinements as in run_greedy_algorithm,
+    and the result has the same keys. Beam search keeps no memo: in
+    cache_stats a hit is a child dropped as a duplicate before scoring and
+    a miss is a child scored.
+    
+    compact: sample CompactPartition keys instead of tuple-of-tuples
+    """
+    n = tpm.shape[0]
+    
+    if verbose:
+        print(f"Starting Beam Search for n={n} states...")
+        print(f"Beam width: {beam_width}")
+    
+    if compact:
+        to_partition = lambda labels: CompactPartition.from_labels(labels)
+    else:
+        to_partition = labels_to_partition
+    
+    beam = np.arange(n, dtype=np.uint8)[None, :]
+    cp_dict = {to_partition(beam[0]): calculate_cp(tpm)}
+    n_children = 0
+    n_scored = 1
+    
+    for k in range(n, 1, -1):
+        children = merge_children(beam)
+        n_children += len(children)
+        
+        # Drop duplicates (two parents sharing a child), keeping merge order
+        _, first = np.unique(children, axis=0, return_index=True)
+        children = children[np.sort(first)]
+        n_scored += len(children)
+        
+        cps = calculate_cp_labels(tpm, children)
+        for labels, cp in zip(children, cps.tolist()):
+            partition = to_partition(labels)
+            if partition not in cp_dict:
+                cp_dict[partition] = cp
+        
+        beam = children[rank_merges(cps)[:beam_width]]
+        
+        if verbose and (k - 1) % 2 == 0:
+            print(f"  Progress: dimensionality {k - 1}, sampled {len(cp_dict)} partitions")
+    
+    if verbose:
+        print(f"Completed: {len(cp_dict)} unique partitions sampled")
+    
+    # Max CP over sampled strict refinements
+    refinement_index = RefinementIndex(cp_dict)
+    delta_cp_dict = {
+        partition: cp - max(0.0, refinement_index.max_refinement_cp(partition))
+        for partition, cp in cp_dict.items()
+    }
+    
+    n_duplicates = n_children - (n_scored - 1)
+    cache_stats = {
+        'hits': n_duplicates,
+        'misses': n_scored,
+        'evictions': 0,
+        'size': len(cp_dict),
+        'maxsize': None,
+        'hit_rate': n_duplicates / (n_duplicates + n_scored)
+    }
+    
+    threshold = 1e-10
+    emergent = [p for p in cp_dict.keys() if delta_cp_dict[p] > threshold]
+    
+    if verbose:
+        print(f"Found {len(emergent)} emergent more scales (ΔCP > {threshold})")
+    
+    return {
+        'cp_dict': cp_dict,
+        'delta_cp_dict': delta_cp_dict,
+        'emergent': emergent,
+        'n_sampled': len(cp_dict),
+        'refinement_index': refinement_index,
+        'cache_stats': cache_stats
+    }
@@ -12,120 +12,540 @@ Based on: Engineering Emergence (Jansma & Hoel, 2025)
 
 import numpy as np
 from itertools import combinations
-from typing import List, Tuple, Dict, Set
+from typing import List, Tuple, Dict, Set, Iterator, Optional
 import networkx as nx
+from compact_partition import CompactPartition
 
-def generate_all_partitions(n: int) -> List[Tuple[Tuple[int, ...], ...]]:
+try:
+    import scipy.sparse as sp
+except ImportError:  # optional: sparse TPMs
+    sp = None
+
+# Largest n for block_row_sums (2^n cached rows)
+BLOCK_CACHE_MAX_N = 20
+
+def iter_restricted_growth_strings(n: int) -> Iterator[List[int]]:
     """
-    Generate all partitions of set {0, 1, ..., n-1}.
-    Returns list of partitions, each partition is tuple of tuples.
+    Yield restricted growth strings a of length n (a[0] = 0,
+    a[j] <= 1 + max(a[:j])) in lexicographic order, following
+    Knuth, TAOCP 7.2.1.5, Algorithm H.
+    Each RGS is a label vector of one set partition; no duplicates.
+    The same list object is updated in place between yields.
     """
-    def partition_helper(items):
-        if len(items) == 0:
-            yield tuple()
-            return
+    if n == 0:
+        yield []
+        return
+    
+    a = [0] * n
+    # m[j] = max(a[0..j])
+    m = [0] * n
+    while True:
+        yield a
         
-        first = items[0]
-        rest = items[1:]
+        # Rightmost position that can still grow
+        j = n - 1
+        while j > 0 and a[j] == m[j - 1] + 1:
+            j -= 1
+        if j == 0:
+            return
         
-        for smaller_partition in partition_helper(rest):
-            # Add first to existing block
-            for i, block in enumerate(smaller_partition):
-                new_partition = list(smaller_partition)
-                new_partition[i] = tuple(sorted(block + (first,)))
-                yield tuple(sorted(new_partition))
-            # Create new block
-            yield tuple(sorted(smaller_partition + ((first,),)))
+        a[j] += 1
+        m[j] = max(m[j - 1], a[j])
+        for i in range(j + 1, n):
+            a[i] = 0
+            m[i] = m[j]
+
+
+def iter_partitions(n: int) -> Iterator[Tuple[Tuple[int, ...], ...]]:
+    """
+    Lazily yield all partitions of {0, 1, ..., n-1} in RGS order.
+    Blocks are sorted by first element, the same canonical form as
+    generate_all_partitions.
+    """
+    for a in iter_restricted_growth_strings(n):
+        blocks = [[] for _ in range(max(a, default=-1) + 1)]
+        for i, label in enumerate(a):
+            blocks[label].append(i)
+        yield tuple(tuple(block) for block in blocks)
+
+
+def iter_partition_labels(n: int, chunk_size: int = 4096) -> Iterator[np.ndarray]:
+    """
+    Yield all partitions of {0, 1, ..., n-1} as (m, n) uint8 arrays of
+    restricted growth strings, m <= chunk_size, in RGS order.
+    """
+    buffer = np.empty((chunk_size, n), dtype=np.uint8)
+    filled = 0
+    for a in iter_restricted_growth_strings(n):
+        buffer[filled] = a
+        filled += 1
+        if filled == chunk_size:
+            yield buffer.copy()
+            filled = 0
+    if filled:
+        yield buffer[:filled].copy()
+
+
+def extend_partition_labels(
+    labels: np.ndarray,
+    n_blocks: np.ndarray,
+    n: int,
+    k_min: int = 1,
+    k_max: Optional[int] = None,
+    within: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Children of a batch of restricted-growth-string prefixes, in RGS order:
+    each (F, d) prefix with n_blocks blocks is extended by microstate d,
+    keeping only children that can still end with k_min..k_max blocks.
+    within: (n,) labels of a coarser partition; microstate d may only join
+        blocks holding states of its own coarse block (refinements only)
+    Returns: (children (C, d+1) uint8, child_blocks (C,))
+    """
+    k_max = n if k_max is None else k_max
+    d = labels.shape[1]
+    columns = np.arange(int(n_blocks.max()) + 1)
+    allowed = columns[None, :] < n_blocks[:, None]
+    if within is not None:
+        same = within[:d] == within[d]
+        allowed &= (labels[:, same, None] == columns[None, None, :]).any(axis=1)
+    allowed |= (columns[None, :] == n_blocks[:, None]) & (n_blocks[:, None] < k_max)
+    
+    parent, label = np.nonzero(allowed)
+    children = np.concatenate([labels[parent], label[:, None].astype(np.uint8)], axis=1)
+    child_blocks = np.maximum(n_blocks[parent], label + 1)
     
-    items = list(range(n))
-    unique_partitions = set(partition_helper(items))
-    return sorted(list(unique_partitions))
+    # Every remaining microstate can open at most one new block
+    feasible = child_blocks + (n - d - 1) >= k_min
+    return children[feasible], child_blocks[feasible]
+
+
+def generate_all_partitions(n: int) -> List[Tuple[Tuple[int, ...], ...]]:
+    """
+    Generate all partitions of set {0, 1, ..., n-1}.
+    Returns list of partitions, each partition is tuple of tuples.
+    """
+    return sorted(iter_partitions(n))
+
+
+def partition_to_labels(partition: Tuple[Tuple[int, ...], ...], n: int = None) -> np.ndarray:
+    """
+    Convert partition (tuple of tuples or CompactPartition) to label vector.
+    labels[i] = index of the block containing microstate i
+    (block order as given in the partition).
+    """
+    if isinstance(partition, CompactPartition):
+        return partition.labels.astype(np.intp)
+    if n is None:
+        n = sum(len(block) for block in partition)
+    labels = np.empty(n, dtype=np.intp)
+    for macro_idx, block in enumerate(partition):
+        labels[list(block)] = macro_idx
+    return labels
+
+
+def labels_to_partition(labels: np.ndarray) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Convert label vector back to partition (tuple of tuples).
+    Block order follows label order.
+    """
+    labels = np.asarray(labels)
+    k = int(labels.max()) + 1 if labels.size else 0
+    return tuple(tuple(int(i) for i in np.flatnonzero(labels == b)) for b in range(k))
+
+
+def pack_labels(labels: np.ndarray) -> np.ndarray:
+    """
+    Pack restricted growth strings (..., n), n <= 16, into uint64 codes
+    with 4 bits per microstate. Equal partitions get equal codes.
+    """
+    labels = np.asarray(labels)
+    n = labels.shape[-1]
+    if n > 16:
+        raise ValueError(f"pack_labels supports n <= 16, got n={n}")
+    shifts = (4 * np.arange(n)).astype(np.uint64)
+    return (labels.astype(np.uint64) << shifts).sum(axis=-1, dtype=np.uint64)
+
+
+def unpack_labels(codes: np.ndarray, n: int) -> np.ndarray:
+    """Inverse of pack_labels: uint64 codes -> (..., n) uint8 label vectors."""
+    shifts = (4 * np.arange(n)).astype(np.uint64)
+    codes = np.asarray(codes, dtype=np.uint64)
+    return ((codes[..., None] >> shifts) & np.uint64(0xF)).astype(np.uint8)
+
+
+def _normalize_rows(T_macro: np.ndarray) -> np.ndarray:
+    """Normalize rows (last axis) in place, leaving all-zero rows untouched."""
+    row_sums = T_macro.sum(axis=-1, keepdims=True)
+    np.divide(T_macro, row_sums, out=T_macro, where=row_sums > 0)
+    return T_macro
+
+
+def is_sparse_tpm(T) -> bool:
+    """True for scipy.sparse matrices (always False without scipy)."""
+    return sp is not None and sp.issparse(T)
+
+
+def _sparse_triplets(T) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(row, col, value) of the nonzeros of a sparse TPM, duplicates summed."""
+    T = sp.coo_matrix(T)
+    T.sum_duplicates()
+    return T.row.astype(np.intp), T.col.astype(np.intp), T.data.astype(float)
+
+
+def _coarse_grain_sparse(T, labels: np.ndarray, k: int):
+    """Sparse coarse-graining: aggregate the nonzeros by block pair, O(nnz)."""
+    row, col, value = _sparse_triplets(T)
+    macro_row, macro_col = labels[row], labels[col]
+    row_sums = np.bincount(macro_row, weights=value, minlength=k)
+    value = np.divide(value, row_sums[macro_row], out=np.zeros_like(value),
+                      where=row_sums[macro_row] > 0)
+    T_macro = sp.csr_matrix((value, (macro_row, macro_col)), shape=(k, k))
+    T_macro.sum_duplicates()
+    return T_macro
 
 
 def coarse_grain_tpm(T: np.ndarray, partition: Tuple[Tuple[int, ...], ...]) -> np.ndarray:
     """
     Coarse-grain TPM T according to partition.
-    T: n×n transition probability matrix
+    T: n×n transition probability matrix (dense, or scipy.sparse: the
+       result is then a sparse CSR matrix, built from the nonzeros only)
     partition: tuple of tuples, each inner tuple is a macrostate
     Returns: k×k coarse-grained TPM where k = len(partition)
     """
     n = T.shape[0]
     k = len(partition)
-    T_macro = np.zeros((k, k))
+    labels = partition_to_labels(partition, n)
     
-    # Build mapping from microstate to macrostate index
-    micro_to_macro = {}
-    for macro_idx, block in enumerate(partition):
-        for micro_idx in block:
-            micro_to_macro[micro_idx] = macro_idx
+    if is_sparse_tpm(T):
+        return _coarse_grain_sparse(T, labels, k)
     
-    # Coarse-grain: sum probabilities
-    for i in range(n):
-        for j in range(n):
-            macro_i = micro_to_macro[i]
-            macro_j = micro_to_macro[j]
-            T_macro[macro_i, macro_j] += T[i, j]
+    # Coarse-grain: sum probabilities into (macro_i, macro_j) bins
+    idx = labels[:, None] * k + labels[None, :]
+    T_macro = np.bincount(idx.ravel(), weights=T.ravel(), minlength=k * k).reshape(k, k)
     
-    # Normalize rows
-    for i in range(k):
-        row_sum = T_macro[i, :].sum()
-        if row_sum > 0:
-            T_macro[i, :] /= row_sum
+    return _normalize_rows(T_macro)
+
+
+def coarse_grain_tpm_batch(T: np.ndarray, labels: np.ndarray, k: int) -> np.ndarray:
+    """
+    Coarse-grain TPM T according to a stack of partitions with k blocks each.
+    T: n×n transition probability matrix
+    labels: (P, n) label vectors, values in 0..k-1
+    Returns: (P, k, k) stack of coarse-grained TPMs
+    """
+    labels = np.asarray(labels, dtype=np.intp)
+    P, n = labels.shape
     
-    return T_macro
+    # Flat bin index of (partition, macro_i, macro_j) for every micro pair (i, j)
+    idx = (np.arange(P)[:, None, None] * k + labels[:, :, None]) * k + labels[:, None, :]
+    weights = np.broadcast_to(T, (P, n, n))
+    T_macro = np.bincount(idx.ravel(), weights=weights.ravel(), minlength=P * k * k)
+    
+    return _normalize_rows(T_macro.reshape(P, k, k))
 
-def calculate_determinism(T: np.ndarray) -> float:
+def block_row_sums(T: np.ndarray) -> np.ndarray:
     """
-    Calculate determinism of TPM T.
-    determinism = 1 - H(E|C) / log2(n)
+    Summed micro rows of every block of microstates, keyed by bitmask:
+    R[mask] = sum of T[i] over the bits i of mask.
+    Filled with one row addition per block (2^n rows of n values, n <= BLOCK_CACHE_MAX_N).
+    Returns: (2^n, n) array
     """
+    T = np.asarray(T, dtype=float)
     n = T.shape[0]
-    if n == 1:
-        return 1.0
-    
-    H_E_given_C = 0.0
+    if n > BLOCK_CACHE_MAX_N:
+        raise ValueError(f"block_row_sums supports n <= {BLOCK_CACHE_MAX_N}, got n={n}")
+    R = np.zeros((1 << n, n))
     for i in range(n):
-        for j in range(n):
-            if T[i, j] > 0:
-                H_E_given_C -= T[i, j] * np.log2(T[i, j])
+        # Blocks whose highest microstate is i extend the blocks below i
+        R[1 << i:1 << (i + 1)] = R[:1 << i] + T[i]
+    return R
+
+
+def block_masks(labels: np.ndarray, k: int) -> np.ndarray:
+    """
+    Bitmask of every block of a stack of partitions with k blocks each.
+    labels: (P, n) label vectors, values in 0..k-1
+    Returns: (P, k) int64 masks
+    """
+    labels = np.asarray(labels, dtype=np.intp)
+    P, n = labels.shape
+    bins = (np.arange(P)[:, None] * k + labels).ravel()
+    bits = np.broadcast_to(np.exp2(np.arange(n)), (P, n)).ravel()
+    return np.bincount(bins, weights=bits, minlength=P * k).astype(np.int64).reshape(P, k)
+
+
+def coarse_grain_tpm_blocks(block_rows: np.ndarray, labels: np.ndarray, k: int) -> np.ndarray:
+    """
+    coarse_grain_tpm_batch from cached block rows (see block_row_sums):
+    each macro row gathers its block's summed micro row (k·n reads instead
+    of n² additions), then a one-hot matmul sums the columns by block
+    (k²·n multiply-adds per partition; at these sizes it beats a k·n
+    bincount or reduceat reduction).
+    labels: (P, n) label vectors, values in 0..k-1
+    Returns: (P, k, k) stack of coarse-grained TPMs
+    """
+    labels = np.asarray(labels, dtype=np.intp)
+    P, n = labels.shape
+    rows = block_rows[block_masks(labels, k)]
+    one_hot = np.zeros((P, n, k))
+    one_hot[np.arange(P)[:, None], np.arange(n)[None, :], labels] = 1.0
+    return _normalize_rows(np.matmul(rows, one_hot))
+
+
+def coarse_grain_tpm_grid(T_grid: np.ndarray, labels: np.ndarray, k: int) -> np.ndarray:
+    """
+    Coarse-grain a stack of TPMs by a stack of partitions with k blocks each.
+    T_grid: (G, n, n) TPMs (e.g. one per parameter value)
+    labels: (P, n) label vectors, values in 0..k-1
+    Returns: (G, P, k, k) coarse-grained TPMs, as E^T T E with one-hot E
+    """
+    labels = np.asarray(labels, dtype=np.intp)
+    P, n = labels.shape
+    one_hot = np.zeros((P, n, k))
+    one_hot[np.arange(P)[:, None], np.arange(n)[None, :], labels] = 1.0
     
-    H_E_given_C /= n  # Average over uniform p(C)
-    determinism = 1.0 - H_E_given_C / np.log2(n)
+    # Sum rows within blocks, then columns within blocks
+    rows = np.matmul(one_hot.transpose(0, 2, 1)[None], T_grid[:, None])
+    return _normalize_rows(np.matmul(rows, one_hot[None]))
+
+
+def _entropy_terms(P: np.ndarray) -> np.ndarray:
+    """
+    Elementwise -p·log2(p) with the convention 0·log2(0) = 0 (masked xlogy).
+    """
+    positive = P > 0
+    return -P * np.log2(np.where(positive, P, 1.0), where=positive, out=np.zeros_like(P))
+
+
+def calculate_determinism_batch(T_stack: np.ndarray) -> np.ndarray:
+    """
+    Calculate determinism for a (P, k, k) stack of TPMs.
+    determinism = 1 - H(E|C) / log2(k)
+    Returns: (P,) array
+    """
+    P, k, _ = T_stack.shape
+    if k == 1:
+        return np.ones(P)
     
-    return determinism
+    # Average over uniform p(C)
+    H_E_given_C = _entropy_terms(T_stack).sum(axis=(1, 2)) / k
+    return 1.0 - H_E_given_C / np.log2(k)
 
-def calculate_degeneracy(T: np.ndarray) -> float:
+
+def calculate_degeneracy_batch(T_stack: np.ndarray) -> np.ndarray:
     """
-    Calculate degeneracy of TPM T.
-    degeneracy = 1 - H(E) / log2(n)
+    Calculate degeneracy for a (P, k, k) stack of TPMs.
+    degeneracy = 1 - H(E) / log2(k)
+    Returns: (P,) array
     """
-    n = T.shape[0]
-    if n == 1:
-        return 1.0
+    P, k, _ = T_stack.shape
+    if k == 1:
+        return np.ones(P)
     
     # Marginal distribution over effects (uniform prior over causes)
-    T_e = T.mean(axis=0)
+    T_e = T_stack.mean(axis=1)
+    H_E = _entropy_terms(T_e).sum(axis=1)
+    return 1.0 - H_E / np.log2(k)
+
+
+def calculate_cp_batch(T_stack: np.ndarray) -> np.ndarray:
+    """
+    Calculate CP = determinism + specificity - 1 for a (P, k, k) stack of TPMs.
+    Returns: (P,) array
+    """
+    det = calculate_determinism_batch(T_stack)
+    specificity = 1.0 - calculate_degeneracy_batch(T_stack)
+    return det + specificity - 1.0
+
+
+def calculate_cp_partitions(
+    T: np.ndarray,
+    partitions: List[Tuple[Tuple[int, ...], ...]],
+    chunk_size: int = 4096
+) -> np.ndarray:
+    """
+    Calculate CP of T coarse-grained by each partition.
+    Partitions are grouped by block count and scored in chunks
+    of at most chunk_size with the batched kernels.
+    Returns: array of CP values in the order of partitions
+    """
+    n = T.shape[0]
+    cp = np.empty(len(partitions))
     
-    H_E = 0.0
-    for prob in T_e:
-        if prob > 0:
-            H_E -= prob * np.log2(prob)
+    by_k: Dict[int, List[int]] = {}
+    for idx, p in enumerate(partitions):
+        by_k.setdefault(len(p), []).append(idx)
     
-    degeneracy = 1.0 - H_E / np.log2(n)
+    for k, indices in by_k.items():
+        for start in range(0, len(indices), chunk_size):
+            chunk = indices[start:start + chunk_size]
+            labels = np.array([partition_to_labels(partitions[i], n) for i in chunk])
+            cp[chunk] = calculate_cp_batch(coarse_grain_tpm_batch(T, labels, k))
     
-    return degeneracy
+    return cp
+
+
+def calculate_cp_labels(
+    T: np.ndarray,
+    labels: np.ndarray,
+    block_rows: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Calculate CP of T coarse-grained by each row of a (P, n) array of
+    restricted growth strings (e.g. a chunk from iter_partition_labels).
+    block_rows: block_row_sums(T), to coarse-grain from cached block rows
+    Returns: (P,) array of CP values
+    """
+    labels = np.asarray(labels)
+    cp = np.empty(len(labels))
+    block_counts = labels.max(axis=1).astype(np.intp) + 1
+    
+    for k in np.unique(block_counts):
+        mask = block_counts == k
+        if block_rows is None:
+            T_macro = coarse_grain_tpm_batch(T, labels[mask], int(k))
+        else:
+            T_macro = coarse_grain_tpm_blocks(block_rows, labels[mask], int(k))
+        cp[mask] = calculate_cp_batch(T_macro)
+    
+    return cp
+
+
+def _sparse_entropies(T) -> Tuple[float, float]:
+    """H(E|C) and H(E) of a sparse TPM under a uniform p(C), over the nonzeros only."""
+    n = T.shape[0]
+    _, col, value = _sparse_triplets(T)
+    H_E_given_C = _entropy_terms(value).sum() / n
+    T_e = np.bincount(col, weights=value, minlength=n) / n
+    return H_E_given_C, _entropy_terms(T_e).sum()
+
+
+def calculate_determinism(T: np.ndarray) -> float:
+    """
+    Calculate determinism of TPM T (dense or scipy.sparse).
+    determinism = 1 - H(E|C) / log2(n)
+    """
+    if is_sparse_tpm(T):
+        n = T.shape[0]
+        return 1.0 - _sparse_entropies(T)[0] / np.log2(n) if n > 1 else 1.0
+    return float(calculate_determinism_batch(T[None])[0])
+
+def calculate_degeneracy(T: np.ndarray) -> float:
+    """
+    Calculate degeneracy of TPM T (dense or scipy.sparse).
+    degeneracy = 1 - H(E) / log2(n)
+    """
+    if is_sparse_tpm(T):
+        n = T.shape[0]
+        return 1.0 - _sparse_entropies(T)[1] / np.log2(n) if n > 1 else 1.0
+    return float(calculate_degeneracy_batch(T[None])[0])
 
 def calculate_cp(T: np.ndarray) -> float:
     """
-    Calculate causal primitives (CP) of TPM T.
+    Calculate causal primitives (CP) of TPM T (dense or scipy.sparse).
     CP = determinism + specificity - 1
        = determinism + (1 - degeneracy) - 1
        = determinism - degeneracy
     """
-    det = calculate_determinism(T)
-    deg = calculate_degeneracy(T)
-    specificity = 1.0 - deg
-    cp = det + specificity - 1.0
+    if is_sparse_tpm(T):
+        n = T.shape[0]
+        if n == 1:
+            return 0.0
+        H_E_given_C, H_E = _sparse_entropies(T)
+        return float((H_E - H_E_given_C) / np.log2(n))
+    return float(calculate_cp_batch(T[None])[0])
+
+
+def merge_partition_blocks(
+    partition: Tuple[Tuple[int, ...], ...], i: int, j: int
+) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Merge blocks i < j of partition. For partitions with blocks sorted by
+    first element the merged block stays at index i and block j is removed.
+    """
+    if isinstance(partition, CompactPartition):
+        return partition.merge(i, j)
+    merged_block = tuple(sorted(partition[i] + partition[j]))
+    new_partition = [merged_block if idx == i else block
+                     for idx, block in enumerate(partition) if idx != j]
+    return tuple(sorted(new_partition, key=lambda x: x[0]))
+
+
+def block_weights(T: np.ndarray, partition: Tuple[Tuple[int, ...], ...]) -> np.ndarray:
+    """
+    Row sums of the un-normalized coarse-grained TPM (block sizes for a
+    row-stochastic T). Needed to merge rows of a normalized macro TPM.
+    """
+    labels = partition_to_labels(partition, T.shape[0])
+    return np.bincount(labels, weights=T.sum(axis=1), minlength=len(partition))
+
+
+def _merged_rows(T_macro: np.ndarray, weights: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Weighted average of rows a and b (before their columns are merged)."""
+    w_ab = weights[a] + weights[b]
+    rows = weights[a, None] * T_macro[a] + weights[b, None] * T_macro[b]
+    np.divide(rows, w_ab[:, None], out=rows, where=w_ab[:, None] > 0)
+    return rows
+
+
+def calculate_merge_cp(T_macro: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    CP of every single-merge child of a k×k macro TPM, without coarse-graining
+    from the microscale.
     
-    return cp
+    Merging blocks a < b replaces rows a, b by their weighted average M and
+    columns a, b by their sum. Row entropies of the other rows change only
+    through the merged column, and column sums change only by -T_a - T_b + M,
+    so each child costs O(k) given the parent's entropy terms.
+    
+    T_macro: k×k normalized macro TPM
+    weights: (k,) row sums before normalization (see block_weights)
+    Returns: (k(k-1)/2,) CP values, pairs in itertools.combinations order
+    """
+    k = T_macro.shape[0]
+    a, b = np.triu_indices(k, 1)
+    k_new = k - 1
+    if k_new == 1:
+        return np.zeros(len(a))
+    
+    # Determinism: row entropies with columns a, b merged
+    h = _entropy_terms(T_macro)
+    H_rows = h.sum(axis=1)
+    # Change of row i's entropy when its columns a and b are merged
+    delta = _entropy_terms(T_macro[:, a] + T_macro[:, b]) - h[:, a] - h[:, b]
+    M = _merged_rows(T_macro, weights, a, b)
+    M_merged = M[np.arange(len(a)), a] + M[np.arange(len(a)), b]
+    h_M = _entropy_terms(M)
+    H_M = (h_M.sum(axis=1) - h_M[np.arange(len(a)), a] - h_M[np.arange(len(a)), b]
+           + _entropy_terms(M_merged))
+    H_others = (H_rows.sum() - H_rows[a] - H_rows[b]
+                + delta.sum(axis=0) - delta[a, np.arange(len(a))] - delta[b, np.arange(len(a))])
+    det = 1.0 - (H_others + H_M) / k_new / np.log2(k_new)
+    
+    # Degeneracy: column sums with rows a, b replaced by M
+    col_sums = T_macro.sum(axis=0)[None, :] - T_macro[a] - T_macro[b] + M
+    idx = np.arange(len(a))
+    merged_col = col_sums[idx, a] + col_sums[idx, b]
+    h_E = _entropy_terms(col_sums / k_new)
+    H_E = h_E.sum(axis=1) - h_E[idx, a] - h_E[idx, b] + _entropy_terms(merged_col / k_new)
+    deg = 1.0 - H_E / np.log2(k_new)
+    
+    return det + (1.0 - deg) - 1.0
 
+
+def merge_macro_tpm(
+    T_macro: np.ndarray, weights: np.ndarray, i: int, j: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Macro TPM and weights after merging blocks i < j (merged block at index i).
+    Matches coarse_grain_tpm(T, merge_partition_blocks(partition, i, j)).
+    """
+    T_new = T_macro.copy()
+    T_new[i] = _merged_rows(T_macro, weights, np.array([i]), np.array([j]))[0]
+    T_new[:, i] += T_new[:, j]
+    T_new = np.delete(np.delete(T_new, j, axis=0), j, axis=1)
+    
+    weights_new = np.delete(weights, j)
+    weights_new[i] = weights[i] + weights[j]
+    return T_new, weights_new
@@ -0,0 +1,140 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+Compact partition representation: restricted growth string stored as bytes.
+
+A CompactPartition of n microstates takes ~n bytes of payload instead of a
+tuple of tuples, hashes through the cached bytes hash, and behaves like the
+tuple form where the pipeline needs it (len() is the number of blocks,
+iteration and indexing yield blocks sorted by first element), so ce2_core,
+the search algorithms and the analysis scripts accept either form.
+"""
+
+import numpy as np
+from typing import Iterator, Tuple
+
+class CompactPartition:
+    """Set partition of {0, ..., n-1} in canonical restricted-growth form."""
+    
+    __slots__ = ('_rgs', '_k')
+    
+    def __init__(self, rgs: bytes):
+        """rgs: canonical restricted growth string (use the from_* constructors otherwise)"""
+        self._rgs = bytes(rgs)
+        self._k = max(self._rgs) + 1 if self._rgs else 0
+    
+    # Construction and conversion
+    
+    @classmethod
+    def from_labels(cls, labels) -> "CompactPartition":
+        """From any label vector; labels are renumbered by first occurrence."""
+        relabel = {}
+        rgs = bytearray(len(labels))
+        for i, label in enumerate(labels):
+            rgs[i] = relabel.setdefault(int(label), len(relabel))
+        return cls(rgs)
+    
+    @classmethod
+    def from_tuple(cls, partition: Tuple[Tuple[int, ...], ...]) -> "CompactPartition":
+        """From the tuple-of-tuples form (any block order)."""
+        n = sum(len(block) for block in partition)
+        rgs = bytearray(n)
+        for label, block in enumerate(sorted(partition, key=min)):
+            for i in block:
+                rgs[i] = label
+        return cls(rgs)
+    
+    @classmethod
+    def from_code(cls, code: int, n: int) -> "CompactPartition":
+        """From a packed 64-bit code (4 bits per microstate, see ce2_core.pack_labels)."""
+        return cls(bytes((int(code) >> (4 * i)) & 0xF for i in range(n)))
+    
+    @classmethod
+    def microscale(cls, n: int) -> "CompactPartition":
+        return cls(bytes(range(n)))
+    
+    def to_tuple(self) -> Tuple[Tuple[int, ...], ...]:
+        """Lossless conversion to the tuple-of-tuples form."""
+        return tuple(self.blocks())
+    
+    @property
+    def rgs(self) -> bytes:
+        return self._rgs
+    
+    @property
+    def labels(self) -> np.ndarray:
+        """Label vector as a read-only uint8 array (no copy)."""
+        return np.frombuffer(self._rgs, dtype=np.uint8)
+    
+    @property
+    def code(self) -> int:
+        """Packed 64-bit code, n <= 16."""
+        if len(self._rgs) > 16:
+            raise ValueError(f"packed codes support n <= 16, got n={len(self._rgs)}")
+        return sum(label << (4 * i) for i, label in enumerate(self._rgs))
+    
+    @property
+    def n(self) -> int:
+        return len(self._rgs)
+    
+    # Tuple-like behaviour: a sequence of blocks
+    
+    def blocks(self) -> Iterator[Tuple[int, ...]]:
+        """Blocks in label order (sorted by first element)."""
+        members = [[] for _ in range(self._k)]
+        for i, label in enumerate(self._rgs):
+            members[label].append(i)
+        return (tuple(block) for block in members)
+    
+    def __len__(self) -> int:
+        return self._k
+    
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        return self.blocks()
+    
+    def __getitem__(self, b: int) -> Tuple[int, ...]:
+        if b < 0:
+            b += self._k
+        return tuple(i for i, label in enumerate(self._rgs) if label == b)
+    
+    def __hash__(self) -> int:
+        return hash(self._rgs)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactPartition):
+            return self._rgs == other._rgs
+        return NotImplemented
+    
+    def __lt__(self, other: "CompactPartition") -> bool:
+        # Same order as sorting the tuple forms
+        return self.to_tuple() < other.to_tuple()
+    
+    def __repr__(self) -> str:
+        return f"CompactPartition({self.to_tuple()})"
+    
+    def __reduce__(self):
+        return (CompactPartition, (self._rgs,))
+    
+    # Lattice operations
+    
+    def merge(self, i: int, j: int) -> "CompactPartition":
+        """Merge blocks i < j; the result is again canonical."""
+        if i > j:
+            i, j = j, i
+        return CompactPartition(bytes(
+            i if label == j else label - 1 if label > j else label
+            for label in self._rgs
+        ))
+    
+    def refines(self, other: "CompactPartition") -> bool:
+        """True if every block of self lies inside a block of other (self ≤ other)."""
+        image = {}
+        for a, b in zip(self._rgs, other._rgs):
+            if image.setdefault(a, b) != b:
+                return False
+        return True
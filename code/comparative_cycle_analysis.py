@@ -16,32 +16,49 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from result_store import is_column_store, load_columns
+from parameter_sweep import run_adaptive_sweep
+
+SUMMARY_COLUMNS = ['p_self', 'cp_micro', 'cp_macro', 'delta_cp', 'n_emergent_corrected']
+
 def load_results(filepath):
     """Loads pickle results"""
     with open(filepath, 'rb') as f:
         return pickle.load(f)
 
+def load_summary(name, columns=SUMMARY_COLUMNS):
+    """
+    Loads only the given columns of a sweep: from the column store
+    results/<name>/ if present, otherwise from results/<name>.pkl
+    """
+    store = Path('results') / name
+    if is_column_store(store):
+        return load_columns(store, columns)
+    results = load_results(store.with_suffix('.pkl'))
+    return {column: np.array([r[column] for r in results]) for column in columns}
+
 def create_comparison_plots():
     """Creates comparative plots"""
     # Load data
-    results_6 = load_results('results/sensitivity_analysis_6state_corrected.pkl')
-    results_8 = load_results('results/sensitivity_analysis_8state.pkl')
+    results_6 = load_summary('sensitivity_analysis_6state_corrected')
+    results_8 = load_summary('sensitivity_analysis_8state')
     
     # Data extraction
-    p_self_6 = [r['p_self'] for r in results_6]
-    p_self_8 = [r['p_self'] for r in results_8]
+    p_self_6 = results_6['p_self']
+    p_self_8 = results_8['p_self']
     
-    cp_micro_6 = [r['cp_micro'] for r in results_6]
-    cp_micro_8 = [r['cp_micro'] for r in results_8]
+    cp_micro_6 = results_6['cp_micro']
+    cp_micro_8 = results_8['cp_micro']
     
-    cp_macro_6 = [r['cp_macro'] for r in results_6]
-    cp_macro_8 = [r['cp_macro'] for r in results_8]
+    cp_macro_6 = results_6['cp_macro']
+    cp_macro_8 = results_8['cp_macro']
     
-    delta_cp_6 = [r['delta_cp'] for r in results_6]
-    delta_cp_8 = [r['delta_cp'] for r in results_8]
+    delta_cp_6 = results_6['delta_cp']
+    delta_cp_8 = results_8['delta_cp']
     
-    emergent_6 = [r['n_emergent_corrected'] for r in results_6]
-    emergent_8 = [r['n_emergent_corrected'] for r in results_8]
+    emergent_6 = results_6['n_emergent_corrected']
+    emergent_8 = results_8['n_emergent_corrected']
     
     # Create figure
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
@@ -102,16 +119,16 @@ def create_comparison_plots():
     Baseline (p_self = 0.20):
     
     6-state (Two 3-cycles):
-      CP(micro) = {results_6[4]['cp_micro']:.4f}
-      CP(macro) = {results_6[4]['cp_macro']:.4f}
-      ΔCP = {results_6[4]['delta_cp']:.4f}
-      Emergent scales = {results_6[4]['n_emergent_corrected']}
+      CP(micro) = {results_6['cp_micro'][4]:.4f}
+      CP(macro) = {results_6['cp_macro'][4]:.4f}
+      ΔCP = {results_6['delta_cp'][4]:.4f}
+      Emergent scales = {results_6['n_emergent_corrected'][4]}
     
     8-state (Two 4-cycles):
-      CP(micro) = {results_8[4]['cp_micro']:.4f}
-      CP(macro) = {results_8[4]['cp_macro']:.4f}
-      ΔCP = {results_8[4]['delta_cp']:.4f}
-      Emergent scales = {results_8[4]['n_emergent_corrected']}
+      CP(micro) = {results_8['cp_micro'][4]:.4f}
+      CP(macro) = {results_8['cp_macro'][4]:.4f}
+      ΔCP = {results_8['delta_cp'][4]:.4f}
+      Emergent scales = {results_8['n_emergent_corrected'][4]}
     
     KEY INSIGHT:
     Shorter cycles → Complex hierarchy
@@ -137,8 +154,8 @@ def create_comparison_plots():
 
 def print_summary_table():
     """Prints summary table"""
-    results_6 = load_results('results/sensitivity_analysis_6state_corrected.pkl')
-    results_8 = load_results('results/sensitivity_analysis_8state.pkl')
+    results_6 = load_summary('sensitivity_analysis_6state_corrected')
+    results_8 = load_summary('sensitivity_analysis_8state')
     
     print("\n" + "="*80)
     print("CORRECTED COMPARISON TABLE")
@@ -147,8 +164,8 @@ def print_summary_table():
     print("-"*80)
     
     # Baseline p_self = 0.20
-    r6 = results_6[4]
-    r8 = results_8[4]
+    r6 = {name: values[4].item() for name, values in results_6.items()}
+    r8 = {name: values[4].item() for name, values in results_8.items()}
     
     metrics = [
         ('CP(microscale)', r6['cp_micro'], r8['cp_micro']),
@@ -173,10 +190,46 @@ def print_summary_table():
     print("  • Both reach CP(macro) = 1.0 (perfect determinism)")
     print("="*80 + "\n")
 
+def locate_hierarchy_transitions(tol=1e-4):
+    """
+    Locates the p_self values where the emergent hierarchy changes
+    (number of emergent scales or optimal macroscale), starting from
+    the 0.05 sweep grid and bisecting down to tol
+    """
+    sys.path.insert(0, str(Path(__file__).parent.parent / 'data'))
+    from six_state_two_cycle import create_two_cycle_tpm as create_6state_tpm
+    from analyze_8state_two_4cycles import create_two_cycle_tpm as create_8state_tpm
+    
+    systems = [
+        ('6-state', lambda p: create_6state_tpm(p_self=p)),
+        ('8-state', lambda p: create_8state_tpm(n_states=8, p_self=p))
+    ]
+    
+    print("\n" + "="*80)
+    print(f"HIERARCHY TRANSITIONS (tol = {tol:g})")
+    print("="*80)
+    
+    transitions = {}
+    for name, factory in systems:
+        sweep = run_adaptive_sweep(factory, np.arange(0.0, 0.55, 0.05), tol=tol)
+        grid = sweep['grid']
+        n_emergent = sweep['n_emergent_corrected']
+        
+        print(f"{name}: {sweep['n_evaluations']} evaluations")
+        for low, high in sweep['transitions'] + sweep['unresolved']:
+            i, j = np.searchsorted(grid, [low, high])
+            print(f"  p_self in [{low:.5f}, {high:.5f}]: "
+                  f"{n_emergent[i]} → {n_emergent[j]} emergent scales")
+        transitions[name] = sweep['transitions']
+    
+    print("="*80 + "\n")
+    return transitions
+
 def main():
     print("\nCreating comparative visualizations...")
     create_comparison_plots()
     print_summary_table()
+    locate_hierarchy_transitions()
 
 if __name__ == "__main__":
     main()
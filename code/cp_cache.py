@@ -0,0 +1,91 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+Bounded LRU memo for per-partition results (CP values, greedy successors),
+keyed by a compact canonical encoding of the partition.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from compact_partition import CompactPartition
+
+def partition_key(partition: Tuple[Tuple[int, ...], ...]) -> bytes:
+    """
+    Canonical key of a partition: its restricted growth string as bytes
+    (label of microstate i = rank of its block by smallest element).
+    Supports up to 256 blocks.
+    """
+    if isinstance(partition, CompactPartition):
+        return partition.rgs
+    n = sum(len(block) for block in partition)
+    labels = bytearray(n)
+    for label, block in enumerate(sorted(partition, key=min)):
+        for i in block:
+            labels[i] = label
+    return bytes(labels)
+
+class CPCache:
+    """
+    LRU cache keyed by partition_key, with hit/miss/eviction counters.
+    maxsize=None means unbounded.
+    """
+    
+    def __init__(self, maxsize: Optional[int] = 100_000):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[bytes, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __contains__(self, partition) -> bool:
+        return partition_key(partition) in self._data
+    
+    def get(self, partition, default=None):
+        """Look up partition, counting a hit or miss."""
+        key = partition_key(partition)
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return default
+    
+    def put(self, partition, value):
+        """Store value for partition, evicting the least recently used entry if full."""
+        key = partition_key(partition)
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Counters for tuning maxsize."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+def merge_cache_stats(stats_list) -> Dict[str, Any]:
+    """Sum counters of several caches (e.g. one per worker process)."""
+    merged = {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0}
+    for stats in stats_list:
+        for name in merged:
+            merged[name] += stats[name]
+    merged['maxsize'] = stats_list[0]['maxsize'] if stats_list else None
+    lookups = merged['hits'] + merged['misses']
+    merged['hit_rate'] = merged['hits'] / lookups if lookups else 0.0
+    return merged
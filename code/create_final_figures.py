@@ -40,8 +40,8 @@ def get_10state_data():
     
     # Greedy for emergent scales
     results = run_greedy_algorithm(tpm, n_paths=100, verbose=False)
-    microscale = tuple((i,) for i in range(10))
-    emergent = [p for p in results['emergent'] if p != microscale]
+    # Exclude microscale (the only partition with 10 blocks)
+    emergent = [p for p in results['emergent'] if len(p) < 10]
     
     return {
         'cp_micro': cp_micro,
@@ -0,0 +1,240 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+Decomposition of a TPM into communicating classes and independent subsystems.
+
+Communicating classes are the strongly connected components of the
+transition graph; closed classes are recurrent, the remaining states
+transient. Subsystems are the weakly connected components: no probability
+flows between two subsystems in either direction, so the TPM is block
+diagonal over them (the two-cycle systems have two).
+
+A partition respects the subsystems when each of its blocks lies inside one
+of them. Its macro TPM is then block diagonal too, and with k = Σ k_c blocks
+under a uniform prior
+
+    H(E|C) = Σ_c A_c / k               (A_c: sum of the row entropies of subsystem c)
+    H(E)   = Σ_c (k_c / k) H_c(E) + H(k_c / k)
+
+so CP follows from per-subsystem statistics. Every refinement of a
+respecting partition respects the subsystems as well, so its ΔCP is exact
+on the product of the subsystem lattices: ∏ B(n_c) partitions instead of
+B(Σ n_c). Partitions with blocks across subsystems are not enumerated.
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple
+from ce2_core import (
+    _entropy_terms,
+    coarse_grain_tpm_batch,
+    is_sparse_tpm,
+    labels_to_partition
+)
+from lattice_cache import load_lattice
+from partition_lattice import calculate_delta_cp_lattice
+
+try:
+    from scipy.sparse.csgraph import connected_components
+except ImportError:  # optional: reachability fallback below
+    connected_components = None
+
+def _adjacency(T, atol: float) -> np.ndarray:
+    """Boolean transition graph i -> j (T[i, j] > atol)"""
+    return (T.toarray() if is_sparse_tpm(T) else np.asarray(T)) > atol
+
+def _components(A: np.ndarray, strong: bool) -> np.ndarray:
+    """Component label of every state, numbered by first state"""
+    n = A.shape[0]
+    if connected_components is not None:
+        _, labels = connected_components(A, directed=True,
+                                         connection='strong' if strong else 'weak')
+    else:
+        # Mutual (strong) or undirected (weak) reachability by squaring
+        R = (A if strong else A | A.T) | np.eye(n, dtype=bool)
+        while True:
+            R_next = (R.astype(np.int64) @ R.astype(np.int64)) > 0
+            if (R_next == R).all():
+                break
+            R = R_next
+        labels = (R & R.T).argmax(axis=1)
+    _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    rank = np.empty(len(first), dtype=np.intp)
+    rank[np.argsort(first)] = np.arange(len(first))
+    return rank[inverse]
+
+def communicating_classes(T, atol: float = 1e-12) -> Tuple[List[Tuple[int, ...]], List[bool]]:
+    """
+    Communicating classes of T (strongly connected components) and, for
+    each, whether it is closed (recurrent: no transition leaves it).
+    """
+    A = _adjacency(T, atol)
+    labels = _components(A, strong=True)
+    classes = [tuple(np.flatnonzero(labels == c).tolist()) for c in range(labels.max() + 1)]
+    closed = [not A[list(members)][:, labels != c].any() for c, members in enumerate(classes)]
+    return classes, closed
+
+def independent_subsystems(T, atol: float = 1e-12) -> List[Tuple[int, ...]]:
+    """Weakly connected components of T: groups of states with no flow between them."""
+    labels = _components(_adjacency(T, atol), strong=False)
+    return [tuple(np.flatnonzero(labels == c).tolist()) for c in range(labels.max() + 1)]
+
+def respects_subsystems(partition, subsystems: List[Tuple[int, ...]]) -> bool:
+    """
+    True if every block lies inside one subsystem, i.e. the partition's CP
+    can be computed from per-subsystem statistics (subsystem_cp).
+    """
+    owner = {state: c for c, members in enumerate(subsystems) for state in members}
+    return all(len({owner[state] for state in block}) == 1 for block in partition)
+
+def decompose_tpm(T, atol: float = 1e-12) -> Dict:
+    """
+    Communicating classes, transient states and independent subsystems of T.
+    
+    Returns dict with classes, recurrent (closed classes), transient
+    (states outside closed classes), subsystems, factorizes (more than one
+    subsystem) and reductions (human-readable list of what applies)
+    """
+    n = T.shape[0]
+    classes, closed = communicating_classes(T, atol)
+    subsystems = independent_subsystems(T, atol)
+    recurrent = [members for members, is_closed in zip(classes, closed) if is_closed]
+    transient = tuple(sorted(s for members, is_closed in zip(classes, closed)
+                             if not is_closed for s in members))
+    
+    reductions = [f"{len(classes)} communicating classes: {len(recurrent)} recurrent, "
+                  f"{len(transient)} transient states"]
+    if len(subsystems) > 1:
+        sizes = ", ".join(str(len(members)) for members in subsystems)
+        reductions.append(f"{len(subsystems)} independent subsystems (sizes {sizes}): "
+                          f"CP of respecting partitions from per-subsystem statistics")
+    else:
+        reductions.append("single subsystem: no factorization")
+    
+    return {
+        'classes': classes,
+        'recurrent': recurrent,
+        'transient': transient,
+        'subsystems': subsystems,
+        'factorizes': len(subsystems) > 1,
+        'reductions': reductions,
+        'n': n
+    }
+
+def subsystem_statistics(T_sub: np.ndarray, labels: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Per-partition statistics of one subsystem TPM for subsystem_cp.
+    labels: (P, m) restricted growth strings over the subsystem's states
+    Returns dict with k (blocks), row_entropy (A_c: summed row entropies of
+    the macro TPM) and effect_entropy (H_c(E) under a uniform prior), each (P,)
+    """
+    labels = np.asarray(labels)
+    P = len(labels)
+    k = labels.max(axis=1).astype(np.intp) + 1
+    row_entropy = np.empty(P)
+    effect_entropy = np.empty(P)
+    for kc in np.unique(k):
+        mask = k == kc
+        T_macro = coarse_grain_tpm_batch(T_sub, labels[mask], int(kc))
+        row_entropy[mask] = _entropy_terms(T_macro).sum(axis=(1, 2))
+        effect_entropy[mask] = _entropy_terms(T_macro.mean(axis=1)).sum(axis=1)
+    return {'k': k, 'row_entropy': row_entropy, 'effect_entropy': effect_entropy}
+
+def subsystem_cp(k: List[np.ndarray], row_entropy: List[np.ndarray],
+                 effect_entropy: List[np.ndarray]) -> np.ndarray:
+    """
+    CP of partitions respecting the subsystems from per-subsystem
+    statistics (broadcast together, e.g. one axis per subsystem).
+    """
+    total_k = sum(k)
+    H_cond = sum(row_entropy) / total_k
+    H_E = sum(kc / total_k * Hc + _entropy_terms(kc / total_k)
+              for kc, Hc in zip(k, effect_entropy))
+    # A single block (one subsystem only) has CP 0
+    return np.where(total_k > 1, (H_E - H_cond) / np.log2(np.maximum(total_k, 2)), 0.0)
+
+def run_decomposed_algorithm1(T: np.ndarray, epsilon: float = 1e-10, atol: float = 1e-12,
+                              verbose: bool = True) -> Dict:
+    """
+    Algorithm 1 over the partitions that respect the independent subsystems
+    of T, enumerated as the product of the subsystem lattices.
+    
+    Returns dict with partitions (respecting partitions), cp_dict,
+    delta_cp_dict, emergent (ΔCP exact: refinements respect the subsystems
+    too), decomposition (decompose_tpm), reductions, n_partitions, n.
+    Partitions with blocks across subsystems are not included.
+    """
+    T = np.asarray(T, dtype=float)
+    n = T.shape[0]
+    decomposition = decompose_tpm(T, atol)
+    subsystems = decomposition['subsystems']
+    reductions = list(decomposition['reductions'])
+    
+    if verbose:
+        print(f"Starting decomposed Algorithm 1 for n={n} states...")
+        for line in reductions:
+            print(f"  {line}")
+    
+    # Per-subsystem lattices and statistics
+    lattices, stats = [], []
+    for members in subsystems:
+        lattice = load_lattice(len(members))
+        lattices.append(lattice)
+        stats.append(subsystem_statistics(T[np.ix_(members, members)], np.asarray(lattice['labels'])))
+    shape = tuple(len(lattice['labels']) for lattice in lattices)
+    
+    # CP over the product grid, one axis per subsystem
+    axes = [tuple(-1 if a == c else 1 for a in range(len(shape))) for c in range(len(shape))]
+    cp = subsystem_cp([s['k'].reshape(ax) for s, ax in zip(stats, axes)],
+                      [s['row_entropy'].reshape(ax) for s, ax in zip(stats, axes)],
+                      [s['effect_entropy'].reshape(ax) for s, ax in zip(stats, axes)])
+    cp = np.broadcast_to(cp, shape).ravel()
+    block_counts = sum(np.broadcast_to(s['k'].reshape(ax), shape) for s, ax in zip(stats, axes)).ravel()
+    
+    # Product covers: one subsystem takes a cover step, the others stay
+    index = np.arange(cp.size).reshape(shape)
+    sources, targets = [], []
+    for c, lattice in enumerate(lattices):
+        indptr = np.asarray(lattice['indptr'])
+        src = np.repeat(np.arange(shape[c]), np.diff(indptr))
+        tgt = np.asarray(lattice['indices'])
+        moved = np.moveaxis(index, c, 0)
+        sources.append(moved[src].ravel())
+        targets.append(moved[tgt].ravel())
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+    order = np.argsort(sources, kind='stable')
+    indptr = np.zeros(cp.size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=cp.size), out=indptr[1:])
+    delta_cp = calculate_delta_cp_lattice(cp, indptr, targets[order], block_counts)
+    
+    # Global label vectors: subsystem labels offset by the blocks before them
+    labels = np.zeros((cp.size, n), dtype=np.intp)
+    offset = np.zeros(cp.size, dtype=np.intp)
+    for c, (members, lattice) in enumerate(zip(subsystems, lattices)):
+        choice = np.unravel_index(np.arange(cp.size), shape)[c]
+        labels[:, list(members)] = np.asarray(lattice['labels'])[choice] + offset[:, None]
+        offset += stats[c]['k'][choice]
+    partitions = [tuple(sorted(labels_to_partition(row), key=lambda block: block[0]))
+                  for row in labels]
+    
+    emergent = [p for p, d in zip(partitions, delta_cp.tolist()) if d > epsilon]
+    reductions.append(f"enumerated {cp.size} respecting partitions (product of subsystem lattices)")
+    if verbose:
+        print(f"  Enumerated {cp.size} partitions")
+        print(f"  Found {len(emergent)} emergent scales (ΔCP > {epsilon})")
+    
+    return {
+        'partitions': partitions,
+        'cp_dict': dict(zip(partitions, cp.tolist())),
+        'delta_cp_dict': dict(zip(partitions, delta_cp.tolist())),
+        'emergent': emergent,
+        'decomposition': decomposition,
+        'reductions': reductions,
+        'n_partitions': int(cp.size),
+        'n': n
+    }
@@ -0,0 +1,136 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+Exhaustive CP scoring with incremental macro-TPM updates.
+
+In restricted-growth-string order, the partitions of n microstates come in
+runs that share the labels of microstates 0..n-2 (a prefix with m blocks)
+and differ only in the block of the last microstate x: one of the m blocks,
+or a new one. Consecutive partitions of a run differ by moving x between
+blocks, so each is an update of the prefix's aggregates:
+
+    * only row b (the block receiving x) and column b of the macro TPM change;
+    * H(E|C) is the prefix's per-row entropy sum, corrected by one entry in
+      every other row and by the recomputed row b, O(k);
+    * the effect marginal changes in row b's contribution and in column b, O(k).
+
+Prefix aggregates are built once per prefix by one-hot matmuls, O(n²·k) per
+prefix (O(n²) per partition, amortized over its k+1 extensions), so the
+asymptotic cost matches batched coarse-graining. What changes is the
+entropy work, O(k) log evaluations per partition instead of O(k²), and
+that only B(n-1) prefixes are enumerated; all runs of a chunk are updated
+together in numpy. In practice this is ~1.7-2.3× faster than batched
+scoring at n = 11.
+"""
+
+import numpy as np
+from typing import Iterator, Tuple
+from ce2_core import _entropy_terms, iter_partition_labels, pack_labels
+
+def _safe_divide(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """a / b where b > 0, else 0"""
+    return np.divide(a, b, out=np.zeros(np.broadcast(a, b).shape), where=b > 0)
+
+def _score_prefix_runs(T: np.ndarray, prefixes: np.ndarray, m: int) -> np.ndarray:
+    """
+    CP of every extension of (P, n-1) prefixes with m blocks each by the
+    last microstate (blocks 0..m-1, then a new block m).
+    Returns: (P, m + 1) CP values
+    """
+    P, x = prefixes.shape
+    row_mass = T.sum(axis=1)
+    
+    # Prefix aggregates, padded with an empty block m (the new block)
+    one_hot = np.zeros((P, x, m + 1))
+    one_hot[np.arange(P)[:, None], np.arange(x)[None, :], prefixes] = 1.0
+    one_hot_t = one_hot.transpose(0, 2, 1)
+    M = np.matmul(np.matmul(one_hot_t, T[:x, :x]), one_hot)  # (P, m+1, m+1)
+    into_x = one_hot_t @ T[:x, x]                            # (P, m+1) block -> x
+    from_x = T[x, :x] @ one_hot                              # (P, m+1) x -> block
+    size = one_hot_t @ row_mass[:x]                          # (P, m+1) row sums
+    
+    # Prefix rows normalized by their (unchanged unless receiving x) row sums
+    rows = _safe_divide(M, size[:, :, None])
+    row_entropy = _entropy_terms(rows).sum(axis=2)           # (P, m+1)
+    effect = rows.sum(axis=1)                                # (P, m+1)
+    
+    # Row i != b gains into_x[i] in column b: (P, i, b)
+    column_gain = _safe_divide(into_x, size)
+    entry_change = (_entropy_terms(rows + column_gain[:, :, None])
+                    - _entropy_terms(rows))
+    
+    # New row b (receiving x): (P, b, j)
+    eye = np.eye(m + 1, dtype=bool)
+    new_row = M + from_x[:, None, :] + eye[None] * (into_x + T[x, x])[:, :, None]
+    new_row = _safe_divide(new_row, (size + row_mass[x])[:, :, None])
+    
+    H_cond = (row_entropy.sum(axis=1, keepdims=True) - row_entropy
+              + entry_change.sum(axis=1) - np.diagonal(entry_change, axis1=1, axis2=2)
+              + _entropy_terms(new_row).sum(axis=2))
+    
+    # Effect mass per block, times k: (P, b, j)
+    effect_b = (effect[:, None, :] - rows + new_row
+                + eye[None] * (column_gain.sum(axis=1, keepdims=True) - column_gain)[:, :, None])
+    
+    k = np.full(m + 1, m)
+    k[m] = m + 1
+    H_E = _entropy_terms(effect_b / k[None, :, None]).sum(axis=2)
+    log_k = np.log2(np.maximum(k, 2))
+    cp = (H_E - H_cond / k[None, :]) / log_k[None, :]
+    return np.where(k[None, :] > 1, cp, 0.0)
+
+def iter_cp_incremental(T: np.ndarray, chunk_size: int = 4096) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Stream (labels, cp) over all partitions of the n microstates of T, in
+    restricted-growth-string order (as iter_partition_labels), scoring each
+    as an incremental update of its (n-1)-prefix. chunk_size counts prefixes.
+    """
+    T = np.asarray(T, dtype=float)
+    n = T.shape[0]
+    if n < 2:
+        yield np.zeros((1, n), dtype=np.uint8), np.zeros(1)
+        return
+    
+    for prefixes in iter_partition_labels(n - 1, chunk_size):
+        blocks = prefixes.max(axis=1).astype(np.intp) + 1
+        runs = blocks + 1
+        start = np.concatenate([[0], np.cumsum(runs)[:-1]])
+        total = int(runs.sum())
+        
+        labels = np.empty((total, n), dtype=np.uint8)
+        labels[:, :-1] = np.repeat(prefixes, runs, axis=0)
+        labels[:, -1] = np.arange(total) - np.repeat(start, runs)
+        
+        cp = np.empty(total)
+        for m in np.unique(blocks):
+            rows = np.flatnonzero(blocks == m)
+            m = int(m)
+            slots = start[rows][:, None] + np.arange(m + 1)[None, :]
+            cp[slots] = _score_prefix_runs(T, prefixes[rows], m)
+        
+        yield labels, cp
+
+def calculate_cp_incremental(T: np.ndarray, chunk_size: int = 4096) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    CP of every partition of the microstates of T (see iter_cp_incremental).
+    Returns: (B(n), n) restricted growth strings and (B(n),) CP values
+    """
+    chunks = list(iter_cp_incremental(T, chunk_size))
+    return np.concatenate([c[0] for c in chunks]), np.concatenate([c[1] for c in chunks])
+
+def calculate_cp_labels_incremental(T: np.ndarray, labels: np.ndarray, chunk_size: int = 4096) -> np.ndarray:
+    """
+    CP of the (P, n) restricted growth strings labels (any order, n <= 16),
+    looked up in one incremental pass over all partitions.
+    Returns: (P,) CP values
+    """
+    stream_labels, stream_cp = calculate_cp_incremental(T, chunk_size)
+    stream_codes = pack_labels(stream_labels)
+    order = np.argsort(stream_codes)
+    position = np.searchsorted(stream_codes, pack_labels(labels), sorter=order)
+    return stream_cp[order[position]]
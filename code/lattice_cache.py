@@ -0,0 +1,106 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+Persistent partition-lattice cache keyed by n.
+
+The partition list and the Hasse diagram depend only on n, not on the TPM,
+so they are built once and stored as a column store (see result_store):
+canonical label vectors, packed codes, block counts and the CSR cover
+arrays. Later runs, and other processes, memory-map the files instead of
+rebuilding them.
+"""
+
+import os
+import shutil
+import tempfile
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional
+from ce2_core import generate_all_partitions, pack_labels
+from partition_lattice import partitions_to_label_array, build_hasse_csr
+from result_store import STORE_VERSION, save_columns, load_columns, is_column_store, read_manifest
+
+# Override with the CE2_LATTICE_CACHE environment variable
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "results" / "lattice_cache"
+
+# Bump when the stored arrays change meaning (order, dtypes, columns)
+LATTICE_CACHE_VERSION = 1
+
+# Lattices already mapped by this process
+_mapped: Dict[Path, Dict[str, np.ndarray]] = {}
+
+def lattice_cache_dir(cache_dir=None) -> Path:
+    if cache_dir is not None:
+        return Path(cache_dir)
+    return Path(os.environ.get('CE2_LATTICE_CACHE', DEFAULT_CACHE_DIR))
+
+def build_lattice(n: int) -> Dict[str, np.ndarray]:
+    """
+    Lattice arrays for n microstates, partitions in generate_all_partitions
+    order: labels (P, n) uint8, block_count, code (n <= 16), indptr, indices.
+    """
+    labels = partitions_to_label_array(generate_all_partitions(n))
+    indptr, indices = build_hasse_csr(labels)
+    lattice = {
+        'labels': labels,
+        'block_count': labels.max(axis=1).astype(np.uint8) + 1,
+        'indptr': indptr,
+        'indices': indices
+    }
+    if n <= 16:
+        lattice['code'] = pack_labels(labels)
+    return lattice
+
+def _is_current_store(store: Path, n: int) -> bool:
+    """True if store holds a lattice cache for n in the current format"""
+    if not is_column_store(store):
+        return False
+    try:
+        manifest = read_manifest(store)
+    except (ValueError, OSError):
+        return False
+    metadata = manifest.get('metadata', {})
+    return (manifest.get('version') == STORE_VERSION
+            and metadata.get('kind') == 'lattice_cache'
+            and metadata.get('n') == n
+            and metadata.get('lattice_version', 1) == LATTICE_CACHE_VERSION
+            and {'labels', 'indptr', 'indices'} <= set(manifest['columns']))
+
+def load_lattice(n: int, cache_dir=None, mmap_mode: Optional[str] = 'r') -> Dict[str, np.ndarray]:
+    """
+    Memory-mapped lattice for n microstates, building and storing it on
+    first use. The store is written to a temporary directory and renamed
+    into place, so concurrent processes never see a partial cache. A store
+    from another format version or for another n is rebuilt.
+    """
+    store = lattice_cache_dir(cache_dir) / f"n{n}"
+    if store in _mapped:
+        return _mapped[store]
+    
+    if not _is_current_store(store, n):
+        store.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".n{n}-", dir=store.parent))
+        save_columns(tmp, build_lattice(n), {'kind': 'lattice_cache', 'n': n,
+                                             'lattice_version': LATTICE_CACHE_VERSION})
+        if store.exists():
+            # Move the stale store aside first; rename cannot replace a directory
+            stale = Path(tempfile.mkdtemp(prefix=f".n{n}-stale-", dir=store.parent))
+            try:
+                os.rename(store, stale / "store")
+            except OSError:
+                pass
+            shutil.rmtree(stale, ignore_errors=True)
+        try:
+            os.rename(tmp, store)
+        except OSError:
+            # Another process stored the same lattice first
+            shutil.rmtree(tmp, ignore_errors=True)
+    
+    lattice = load_columns(store, mmap_mode=mmap_mode)
+    _mapped[store] = lattice
+    return lattice
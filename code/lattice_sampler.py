@@ -0,0 +1,181 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+Uniform random sampling of the partition lattice
+
+Partitions with exactly k blocks are drawn uniformly through the Stirling
+recurrence S(m, j) = j·S(m-1, j) + S(m-1, j-1): going from the last
+microstate down, microstate m either opens its own block (probability
+S(m-1, j-1) / S(m, j)) or joins one of the j blocks of the first m-1
+microstates, chosen uniformly. Drawing k with probability S(n, k) / B(n)
+first gives uniform samples over the whole lattice.
+
+Unlike the greedy searches, which follow high-CP paths, these samples give
+unbiased estimates of how CP is spread across dimensionalities, for any n.
+"""
+
+import numpy as np
+from statistics import NormalDist
+from typing import Dict, List, Optional
+from ce2_core import calculate_cp, calculate_cp_labels
+
+def stirling2_table(n: int) -> List[List[int]]:
+    """Stirling numbers of the second kind S(m, j), 0 <= j <= m <= n (exact)"""
+    S = [[0] * (n + 1) for _ in range(n + 1)]
+    S[0][0] = 1
+    for m in range(1, n + 1):
+        for j in range(1, m + 1):
+            S[m][j] = j * S[m - 1][j] + S[m - 1][j - 1]
+    return S
+
+def _open_probabilities(S: List[List[int]]) -> np.ndarray:
+    """p[m, j] = S(m-1, j-1) / S(m, j): microstate m opens a new block"""
+    n = len(S) - 1
+    p = np.zeros((n + 1, n + 1))
+    for m in range(1, n + 1):
+        for j in range(1, m + 1):
+            p[m, j] = S[m - 1][j - 1] / S[m][j]
+    return p
+
+def sample_partition_labels(
+    n: int,
+    size: int,
+    k: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    Draw size partitions of n microstates uniformly at random, among those
+    with exactly k blocks if k is given, otherwise among all B(n).
+    Returns: (size, n) restricted growth strings
+    """
+    rng = np.random.default_rng(rng)
+    S = stirling2_table(n)
+    p_open = _open_probabilities(S)
+    
+    if k is None:
+        weights = np.array([float(S[n][j]) for j in range(n + 1)])
+        blocks = rng.choice(n + 1, size=size, p=weights / weights.sum())
+    else:
+        if not 1 <= k <= n:
+            raise ValueError(f"k must be between 1 and {n}")
+        blocks = np.full(size, k)
+    
+    # Backward pass: which microstates open a block
+    opens = np.zeros((size, n), dtype=bool)
+    j = blocks.copy()
+    for m in range(n, 0, -1):
+        opens[:, m - 1] = rng.random(size) < p_open[m, j]
+        j -= opens[:, m - 1]
+    
+    # Forward pass: openers take the next label, the others a uniform
+    # choice among the blocks opened before them
+    opened = np.cumsum(opens, axis=1)
+    before = opened - opens
+    joined = np.floor(rng.random((size, n)) * before).astype(np.intp)
+    return np.where(opens, opened - 1, joined).astype(np.uint8)
+
+def _wilson_interval(successes: np.ndarray, trials: np.ndarray, z: float):
+    """Wilson score interval for binomial proportions"""
+    trials = np.maximum(trials, 1)
+    p = successes / trials
+    center = (p + z**2 / (2 * trials)) / (1 + z**2 / trials)
+    half = z * np.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / (1 + z**2 / trials)
+    return center - half, center + half
+
+def sample_cp_profile(
+    T: np.ndarray,
+    n_samples: int = 10_000,
+    per_block_count: bool = True,
+    bins: int = 20,
+    confidence: float = 0.95,
+    chunk_size: int = 4096,
+    seed=None
+) -> Dict:
+    """
+    Estimate the CP distribution of each dimensionality from random partitions.
+    
+    T: micro TPM (n, n)
+    n_samples: samples per block count 2..n-1 (per_block_count=True), or
+        in total, drawn uniformly over the lattice (per_block_count=False;
+        dimensionalities are then represented by their share of B(n))
+    bins: histogram bins over [0, 1]
+    confidence: level of the confidence intervals
+    chunk_size: partitions sampled and scored per batch
+    
+    Returns dict with cp_micro, bin_edges, and per block count k:
+        n_samples, n_partitions (S(n, k)), mean_cp and mean_ci (normal),
+        histogram (fraction per bin) with hist_ci (Wilson),
+        frac_above_micro with its CI and est_above_micro (count estimate);
+        partitions with CP <= CP(micro) cannot be emergent (ΔCP <= CP - CP(micro))
+    """
+    n = T.shape[0]
+    rng = np.random.default_rng(seed)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    S = stirling2_table(n)
+    cp_micro = calculate_cp(T)
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    
+    block_counts = list(range(2, n)) if n > 2 else []
+    count = {k: 0 for k in block_counts}
+    total = {k: 0.0 for k in block_counts}
+    squares = {k: 0.0 for k in block_counts}
+    above = {k: 0 for k in block_counts}
+    hist = {k: np.zeros(bins, dtype=np.int64) for k in block_counts}
+    
+    def accumulate(labels):
+        cp = calculate_cp_labels(T, labels)
+        ks = labels.max(axis=1).astype(np.intp) + 1
+        for k in np.unique(ks):
+            if k not in count:
+                continue
+            values = cp[ks == k]
+            count[k] += len(values)
+            total[k] += values.sum()
+            squares[k] += (values**2).sum()
+            above[k] += int((values > cp_micro + 1e-10).sum())
+            hist[k] += np.histogram(np.clip(values, 0.0, 1.0), bins=edges)[0]
+    
+    if per_block_count:
+        for k in block_counts:
+            for start in range(0, n_samples, chunk_size):
+                size = min(chunk_size, n_samples - start)
+                accumulate(sample_partition_labels(n, size, k, rng))
+    else:
+        for start in range(0, n_samples, chunk_size):
+            size = min(chunk_size, n_samples - start)
+            accumulate(sample_partition_labels(n, size, None, rng))
+    
+    profile = {}
+    for k in block_counts:
+        m = count[k]
+        if m == 0:
+            continue
+        mean = total[k] / m
+        var = max(squares[k] / m - mean**2, 0.0) * m / max(m - 1, 1)
+        half = z * np.sqrt(var / m)
+        hist_low, hist_high = _wilson_interval(hist[k], m, z)
+        above_low, above_high = _wilson_interval(np.array(above[k]), m, z)
+        profile[k] = {
+            'n_samples': m,
+            'n_partitions': S[n][k],
+            'mean_cp': mean,
+            'mean_ci': (mean - half, mean + half),
+            'histogram': hist[k] / m,
+            'hist_ci': (hist_low, hist_high),
+            'frac_above_micro': above[k] / m,
+            'frac_above_micro_ci': (float(above_low), float(above_high)),
+            'est_above_micro': S[n][k] * above[k] / m
+        }
+    
+    return {
+        'n': n,
+        'cp_micro': cp_micro,
+        'bin_edges': edges,
+        'confidence': confidence,
+        'profile': profile
+    }
@@ -0,0 +1,272 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+Exact and approximate lumpability of the micro Markov chain.
+
+A partition is (ordinarily) lumpable when all microstates of a block send
+the same probability mass into every block, so the macro chain is exactly
+the coarse-grained TPM. The coarsest lumpable refinement of an initial
+partition is found by partition refinement as in Paige-Tarjan / Markov
+chain lumping (Valmari & Franceschinis, 2010): a splitter block C splits
+every block by the flow T[i, C] of its states; after a split only the
+smaller parts become new splitters (the flow into the largest part follows
+from the others), so every state is in O(log n) splitters. For a sparse
+TPM each splitter only visits the predecessors of its states (CSC
+columns), giving O(m log n · log m) for m nonzeros; a dense TPM costs O(n)
+per splitter state, O(n² log n) in total.
+
+With epsilon > 0 states whose flows differ by at most epsilon (single
+linkage along the sorted flows) stay together, giving ε-approximately
+lumpable partitions. The results seed run_greedy_algorithm and
+run_branch_and_bound, and are cheap candidates for exact scoring in
+systems far beyond lattice enumeration.
+"""
+
+import numpy as np
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
+from ce2_core import (
+    calculate_cp,
+    calculate_cp_partitions,
+    coarse_grain_tpm,
+    is_sparse_tpm,
+    labels_to_partition,
+    partition_to_labels
+)
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import breadth_first_order, connected_components
+except ImportError:  # optional: pure-Python BFS below
+    breadth_first_order = None
+
+def _renumber(labels: np.ndarray) -> np.ndarray:
+    """Renumber a label vector by first occurrence (restricted growth string)"""
+    _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    rank = np.empty(len(first), dtype=np.intp)
+    rank[np.argsort(first)] = np.arange(len(first))
+    return rank[inverse]
+
+def _group_values(values: np.ndarray, tol: float) -> np.ndarray:
+    """Group ids of values, cutting the sorted values at gaps larger than tol"""
+    order = np.argsort(values, kind='stable')
+    cuts = np.concatenate([[0], np.diff(values[order]) > tol])
+    groups = np.empty(len(values), dtype=np.intp)
+    groups[order] = np.cumsum(cuts)
+    return groups
+
+def coarsest_lumpable_refinement(
+    T,
+    initial=None,
+    epsilon: float = 0.0,
+    atol: float = 1e-12
+) -> np.ndarray:
+    """
+    Coarsest (ε-)lumpable partition refining initial.
+    
+    T: micro TPM (n, n), dense or scipy.sparse
+    initial: partition or label vector to refine (default: one block)
+    epsilon: flows within epsilon count as equal (0: exact, up to atol)
+    
+    Returns: (n,) restricted growth string
+    """
+    n = T.shape[0]
+    if is_sparse_tpm(T):
+        columns = T.tocsc()
+        def inflow(members):
+            # Predecessors of the splitter's states from the CSC indices,
+            # summed per row: O(e log e) for e entries in those columns
+            starts, ends = columns.indptr[members], columns.indptr[members + 1]
+            entries = np.concatenate([np.arange(a, b) for a, b in zip(starts.tolist(), ends.tolist())]
+                                     or [np.zeros(0, dtype=np.intp)])
+            rows, inverse = np.unique(columns.indices[entries], return_inverse=True)
+            return rows, np.bincount(inverse, weights=columns.data[entries], minlength=len(rows))
+    else:
+        T = np.asarray(T, dtype=float)
+        def inflow(members):
+            flow = T[:, members].sum(axis=1)
+            rows = np.flatnonzero(flow > atol)
+            return rows, flow[rows]
+    
+    if initial is None:
+        labels = np.zeros(n, dtype=np.intp)
+    elif isinstance(initial, np.ndarray):
+        labels = _renumber(initial)
+    else:
+        labels = _renumber(partition_to_labels(initial, n))
+    
+    blocks = [set(np.flatnonzero(labels == b).tolist()) for b in range(int(labels.max()) + 1)]
+    queue = deque(range(len(blocks)))
+    queued = [True] * len(blocks)
+    tol = max(epsilon, atol)
+    
+    while queue:
+        splitter = queue.popleft()
+        queued[splitter] = False
+        rows, flow = inflow(np.fromiter(blocks[splitter], dtype=np.intp))
+        keep = flow > atol
+        rows, flow = rows[keep], flow[keep]
+        
+        # Only blocks with some inflow can be split by this splitter; their
+        # states without inflow form one part at flow 0
+        order = np.argsort(labels[rows], kind='stable')
+        rows, flow = rows[order], flow[order]
+        touched, starts = np.unique(labels[rows], return_index=True)
+        for b, start, end in zip(touched.tolist(), starts.tolist(), starts[1:].tolist() + [len(rows)]):
+            states, values = rows[start:end], flow[start:end]
+            untouched = len(blocks[b]) - len(states)
+            if untouched:
+                values = np.concatenate([[0.0], values])
+            groups = _group_values(values, tol)
+            n_groups = int(groups.max()) + 1
+            if n_groups == 1:
+                continue
+            
+            # The largest part keeps id b; the others become new blocks
+            sizes = np.bincount(groups, minlength=n_groups)
+            if untouched:
+                sizes[groups[0]] += untouched - 1
+                zero_group, groups = int(groups[0]), groups[1:]
+            else:
+                zero_group = -1
+            largest = int(sizes.argmax())
+            for g in range(n_groups):
+                if g == largest:
+                    continue
+                if g == zero_group:
+                    # Smaller than the largest part, so O(touched states)
+                    part = blocks[b] - set(states.tolist())
+                    part.update(states[groups == g].tolist())
+                else:
+                    part = set(states[groups == g].tolist())
+                blocks[b] -= part
+                labels[list(part)] = len(blocks)
+                blocks.append(part)
+                queued.append(True)
+                queue.append(len(blocks) - 1)
+            
+            # Approximate flows do not add up exactly, so the largest part
+            # is re-checked as well
+            if epsilon > 0 and not queued[b]:
+                queued[b] = True
+                queue.append(b)
+    
+    return _renumber(labels)
+
+def is_lumpable(T, partition, epsilon: float = 0.0, atol: float = 1e-12) -> bool:
+    """True if partition is (ε-)lumpable, i.e. its own coarsest lumpable refinement."""
+    n = T.shape[0]
+    labels = _renumber(partition_to_labels(partition, n))
+    refined = coarsest_lumpable_refinement(T, labels, epsilon, atol)
+    return refined.max() == labels.max()
+
+def _successor_lists(T, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR (indptr, indices) of the transitions i -> j with T[i, j] > threshold"""
+    n = T.shape[0]
+    if is_sparse_tpm(T):
+        C = T.tocsr()
+        row = np.repeat(np.arange(n), np.diff(C.indptr))
+        keep = C.data > threshold
+        row, col = row[keep], C.indices[keep]
+    else:
+        row, col = np.nonzero(np.asarray(T) > threshold)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row, minlength=n), out=indptr[1:])
+    return indptr, col[np.argsort(row, kind='stable')]
+
+def _reachable_sets(T, threshold: float) -> Iterator[np.ndarray]:
+    """
+    Forward-reachable set (including the state itself) of one state per
+    communicating class, as (n,) boolean rows: states of a class reach the
+    same set. BFS over the successor lists, O(n + nnz) per class with
+    scipy; the pure-Python fallback has no class labels and runs one BFS
+    per state.
+    """
+    n = T.shape[0]
+    indptr, indices = _successor_lists(T, threshold)
+    if breadth_first_order is not None:
+        graph = csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(n, n))
+        _, classes = connected_components(graph, directed=True, connection='strong')
+        _, sources = np.unique(classes, return_index=True)
+        for source in np.sort(sources).tolist():
+            row = np.zeros(n, dtype=bool)
+            row[breadth_first_order(graph, source, directed=True, return_predecessors=False)] = True
+            yield row
+        return
+    
+    for source in range(n):
+        row = np.zeros(n, dtype=bool)
+        row[source] = True
+        frontier = deque([source])
+        while frontier:
+            state = frontier.popleft()
+            for successor in indices[indptr[state]:indptr[state + 1]].tolist():
+                if not row[successor]:
+                    row[successor] = True
+                    frontier.append(successor)
+        yield row
+
+def lumpability_seeds(T, threshold: float = 1e-12, singletons: bool = False) -> List[np.ndarray]:
+    """
+    Initial two-block label vectors for coarsest_lumpable_refinement: the
+    states reachable from each state (through transitions above threshold)
+    against the rest, and optionally each state alone.
+    """
+    n = T.shape[0]
+    seeds = {}
+    for row in _reachable_sets(T, threshold):
+        if 0 < row.sum() < n:
+            seeds.setdefault(row.tobytes(), row.astype(np.intp))
+    for i in range(n if singletons else 0):
+        alone = np.zeros(n, dtype=np.intp)
+        alone[i] = 1
+        seeds.setdefault(alone.astype(bool).tobytes(), alone)
+    return list(seeds.values())
+
+def find_lumpable_partitions(
+    T,
+    epsilon: float = 0.0,
+    seeds: Optional[List] = None,
+    atol: float = 1e-12
+) -> List[Tuple[Tuple[int, ...], ...]]:
+    """
+    Distinct coarsest (ε-)lumpable refinements of the seeds (default
+    lumpability_seeds(T), ignoring transitions below epsilon), excluding
+    the single block and the microscale.
+    Returns: partitions (tuple of tuples), by block count, then RGS order
+    """
+    n = T.shape[0]
+    if seeds is None:
+        seeds = lumpability_seeds(T, max(epsilon, atol))
+    
+    found = {}
+    for seed in seeds:
+        labels = coarsest_lumpable_refinement(T, seed, epsilon, atol)
+        k = int(labels.max()) + 1
+        if 1 < k < n:
+            found.setdefault(labels.tobytes(), labels)
+    
+    ordered = sorted(found.values(), key=lambda labels: (labels.max(), labels.tolist()))
+    return [labels_to_partition(labels) for labels in ordered]
+
+def rank_lumpable_partitions(
+    T,
+    epsilon: float = 0.0,
+    seeds: Optional[List] = None,
+    atol: float = 1e-12
+) -> List[Tuple[Tuple[Tuple[int, ...], ...], float]]:
+    """
+    Exact CP of the lumpable partitions from find_lumpable_partitions.
+    Returns: list of (partition, cp), CP descending
+    """
+    partitions = find_lumpable_partitions(T, epsilon, seeds, atol)
+    if is_sparse_tpm(T):
+        cps = [calculate_cp(coarse_grain_tpm(T, p)) for p in partitions]
+    else:
+        cps = calculate_cp_partitions(np.asarray(T, dtype=float), partitions).tolist()
+    return sorted(zip(partitions, cps), key=lambda item: -item[1])
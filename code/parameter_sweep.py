@@ -0,0 +1,197 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+Parameter sweeps with batched TPM evaluation.
+
+All TPMs of a sweep share one partition lattice, so the grid is stacked
+into a (G, n, n) array and every partition chunk is coarse-grained against
+all grid points at once. CP and ΔCP are then computed in single vectorized
+passes over (G, P) arrays, so a fine grid costs little more than a coarse one.
+"""
+
+import numpy as np
+from typing import Callable, Dict, List, Sequence
+from ce2_core import coarse_grain_tpm_grid, calculate_cp_batch, labels_to_partition
+from lattice_cache import load_lattice, build_lattice
+from partition_lattice import calculate_delta_cp_lattice
+
+# Upper bound on elements of the (G, chunk, k, n) intermediate
+GRID_CHUNK_ELEMENTS = 1 << 22
+
+def stack_tpms(tpm_factory: Callable[[float], np.ndarray], grid: Sequence[float]) -> np.ndarray:
+    """
+    Evaluate tpm_factory at every grid value.
+    Returns: (G, n, n) array of TPMs
+    """
+    return np.stack([np.asarray(tpm_factory(value), dtype=float) for value in grid])
+
+def calculate_cp_grid(T_grid: np.ndarray, labels: np.ndarray, block_counts: np.ndarray) -> np.ndarray:
+    """
+    CP of every TPM in T_grid coarse-grained by every partition.
+    T_grid: (G, n, n) TPMs
+    labels: (P, n) label vectors
+    block_counts: (P,) number of blocks per partition
+    Returns: (G, P) CP values
+    """
+    G, n, _ = T_grid.shape
+    block_counts = np.asarray(block_counts)
+    cp = np.empty((G, len(labels)))
+    
+    for k in np.unique(block_counts):
+        k = int(k)
+        rows = np.flatnonzero(block_counts == k)
+        chunk_size = max(1, GRID_CHUNK_ELEMENTS // (G * k * n))
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            T_macro = coarse_grain_tpm_grid(T_grid, labels[chunk], k)
+            cp[:, chunk] = calculate_cp_batch(T_macro.reshape(-1, k, k)).reshape(G, len(chunk))
+    
+    return cp
+
+def evaluate_tpm_grid(T_grid: np.ndarray, lattice: Dict[str, np.ndarray], epsilon: float = 1e-10) -> Dict:
+    """
+    CP, ΔCP and per-point summaries for a stack of TPMs over a shared lattice
+    (see lattice_cache.build_lattice for the lattice arrays).
+    """
+    n = T_grid.shape[1]
+    labels = np.asarray(lattice['labels'])
+    block_counts = np.asarray(lattice['block_count']).astype(np.intp)
+    
+    cp = calculate_cp_grid(T_grid, labels, block_counts)
+    delta_cp = calculate_delta_cp_lattice(cp.T, lattice['indptr'], lattice['indices'],
+                                          block_counts).T
+    
+    micro = int(np.flatnonzero(block_counts == n)[0])
+    coarser = block_counts < n
+    
+    emergent_mask = delta_cp > epsilon
+    
+    # Round before argmax so ties resolve to the first partition, not to noise
+    masked_cp = np.where(coarser, np.round(cp, 12), -np.inf)
+    
+    return {
+        'cp': cp,
+        'delta_cp': delta_cp,
+        'emergent': [np.flatnonzero(row) for row in emergent_mask],
+        'n_emergent': emergent_mask.sum(axis=1),
+        'n_emergent_corrected': (emergent_mask & coarser).sum(axis=1),
+        'cp_micro': cp[:, micro],
+        'optimal_index': masked_cp.argmax(axis=1)
+    }
+
+def run_parameter_sweep(
+    tpm_factory: Callable[[float], np.ndarray],
+    grid: Sequence[float],
+    epsilon: float = 1e-10,
+    use_lattice_cache: bool = True
+) -> Dict:
+    """
+    Algorithm 1 over a parameter grid in one batched pass.
+    
+    tpm_factory: maps a parameter value to an (n, n) TPM
+    grid: parameter values
+    epsilon: ΔCP threshold for emergent partitions
+    use_lattice_cache: memory-map the lattice from the on-disk cache
+    
+    Returns dict with:
+        grid (G,), tpms (G, n, n), partitions (P list), cp and delta_cp (G, P),
+        emergent (per point, indices of partitions with ΔCP > epsilon),
+        n_emergent (G,), n_emergent_corrected (G,) (microscale excluded),
+        cp_micro (G,),
+        optimal_index (G,) (highest-CP partition other than the microscale),
+        n
+    """
+    grid = np.asarray(grid, dtype=float)
+    T_grid = stack_tpms(tpm_factory, grid)
+    n = T_grid.shape[1]
+    
+    lattice = load_lattice(n) if use_lattice_cache else build_lattice(n)
+    
+    sweep = evaluate_tpm_grid(T_grid, lattice, epsilon)
+    sweep.update({
+        'grid': grid,
+        'tpms': T_grid,
+        'partitions': [labels_to_partition(row) for row in lattice['labels']],
+        'n': n
+    })
+    return sweep
+
+def run_adaptive_sweep(
+    tpm_factory: Callable[[float], np.ndarray],
+    grid: Sequence[float],
+    tol: float = 1e-4,
+    epsilon: float = 1e-10,
+    max_evaluations: int = 1000,
+    use_lattice_cache: bool = True
+) -> Dict:
+    """
+    Parameter sweep that bisects around hierarchy transitions.
+    
+    Starts from the coarse grid and repeatedly evaluates the midpoints of
+    neighbouring points whose n_emergent_corrected or optimal partition
+    differ, until every such interval is narrower than tol (or
+    max_evaluations is reached). All midpoints of a round are scored in one
+    batch against the same lattice, and evaluated points are kept, so each
+    round only pays for new parameter values. Transitions that start and
+    end between two coarse points with equal summaries are not detected.
+    
+    Returns the run_parameter_sweep dict over all evaluated points (sorted),
+    plus:
+        transitions: list of (low, high) brackets of width <= tol
+        unresolved: brackets still wider than tol when the budget ran out
+        n_evaluations: number of parameter values scored
+    """
+    grid = np.unique(np.asarray(grid, dtype=float))
+    n = np.asarray(tpm_factory(grid[0])).shape[0]
+    lattice = load_lattice(n) if use_lattice_cache else build_lattice(n)
+    
+    batches = []
+    values = np.empty(0)
+    new_values = grid
+    
+    while True:
+        T_grid = stack_tpms(tpm_factory, new_values)
+        batch = evaluate_tpm_grid(T_grid, lattice, epsilon)
+        batch.update({'grid': new_values, 'tpms': T_grid})
+        batches.append(batch)
+        values = np.concatenate([values, new_values])
+        
+        order = np.argsort(values, kind='stable')
+        n_emergent = np.concatenate([b['n_emergent_corrected'] for b in batches])[order]
+        optimal = np.concatenate([b['optimal_index'] for b in batches])[order]
+        points = values[order]
+        
+        changed = (np.diff(n_emergent) != 0) | (np.diff(optimal) != 0)
+        wide = np.diff(points) > tol
+        low = points[:-1][changed & wide]
+        high = points[1:][changed & wide]
+        
+        if len(low) == 0 or len(values) + len(low) > max_evaluations:
+            break
+        new_values = (low + high) / 2
+    
+    sweep = {}
+    for key in ('grid', 'tpms', 'cp', 'delta_cp', 'n_emergent', 'n_emergent_corrected',
+                'cp_micro', 'optimal_index'):
+        sweep[key] = np.concatenate([b[key] for b in batches])[order]
+    emergent = [e for b in batches for e in b['emergent']]
+    sweep['emergent'] = [emergent[i] for i in order]
+    
+    sweep.update({
+        'partitions': [labels_to_partition(row) for row in lattice['labels']],
+        'transitions': list(zip(points[:-1][changed & ~wide], points[1:][changed & ~wide])),
+        'unresolved': list(zip(low, high)),
+        'n_evaluations': len(values),
+        'n': n
+    })
+    return sweep
+
+def emergent_partitions(sweep: Dict, g: int) -> List[tuple]:
+    """Emergent partitions at grid point g, as in run_algorithm1()['emergent']."""
+    partitions = sweep['partitions']
+    return [partitions[i] for i in sweep['emergent'][g]]
@@ -0,0 +1,217 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+Partition lattice: Hasse diagram built from the covering relation.
+A partition is covered exactly by the partitions obtained by merging
+two of its blocks, so the diagram needs no refinement checks.
+"""
+
+import numpy as np
+import networkx as nx
+from itertools import combinations
+from typing import List, Tuple, Dict, Optional
+from ce2_core import partition_to_labels, pack_labels
+
+def partitions_to_label_array(partitions: List[Tuple[Tuple[int, ...], ...]]) -> np.ndarray:
+    """
+    Stack canonical partitions (blocks sorted by first element) into a
+    (P, n) uint8 array of restricted growth strings.
+    """
+    n = sum(len(block) for block in partitions[0]) if partitions else 0
+    labels = np.empty((len(partitions), n), dtype=np.uint8)
+    for idx, p in enumerate(partitions):
+        labels[idx] = partition_to_labels(p, n)
+    return labels
+
+def merge_labels(labels: np.ndarray, a: int, b: int) -> np.ndarray:
+    """
+    Merge blocks a < b in a stack of restricted growth strings.
+    The result is again a restricted growth string.
+    """
+    merged = np.where(labels == b, a, labels)
+    return np.where(merged > b, merged - 1, merged).astype(labels.dtype)
+
+def build_hasse_csr(labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hasse diagram of the partitions given as (P, n) restricted growth strings.
+    Row p of the CSR adjacency lists the upward covers of p (the partitions
+    obtained by merging two of its blocks) that are present in labels.
+    Cost: O(P·k²) merges with a binary-search lookup each.
+    
+    Returns: (indptr, indices) with indptr of length P + 1
+    """
+    P = len(labels)
+    codes = pack_labels(labels)
+    order = np.argsort(codes)
+    sorted_codes = codes[order]
+    block_counts = labels.max(axis=1).astype(np.intp) + 1 if P else np.zeros(0, dtype=np.intp)
+    
+    sources, targets = [], []
+    for k in np.unique(block_counts):
+        rows = np.flatnonzero(block_counts == k)
+        for a, b in combinations(range(int(k)), 2):
+            merged_codes = pack_labels(merge_labels(labels[rows], a, b))
+            pos = np.minimum(np.searchsorted(sorted_codes, merged_codes), P - 1)
+            found = sorted_codes[pos] == merged_codes
+            sources.append(rows[found])
+            targets.append(order[pos[found]])
+    
+    sources = np.concatenate(sources) if sources else np.zeros(0, dtype=np.intp)
+    targets = np.concatenate(targets) if targets else np.zeros(0, dtype=np.intp)
+    
+    by_source = np.argsort(sources, kind='stable')
+    indptr = np.zeros(P + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=P), out=indptr[1:])
+    indices = targets[by_source].astype(np.int64)
+    return indptr, indices
+
+def hasse_csr_to_graph(
+    partitions: List[Tuple[Tuple[int, ...], ...]],
+    indptr: np.ndarray,
+    indices: np.ndarray
+) -> nx.DiGraph:
+    """
+    Convert CSR covers to a networkx DiGraph with edge πa → πb
+    when πb covers πa (πa refines πb).
+    """
+    indptr, indices = np.asarray(indptr), np.asarray(indices)
+    G = nx.DiGraph()
+    G.add_nodes_from(partitions)
+    for src, p in enumerate(partitions):
+        G.add_edges_from((p, partitions[dst]) for dst in indices[indptr[src]:indptr[src + 1]])
+    return G
+
+def build_hasse_diagram(partitions: List[Tuple[Tuple[int, ...], ...]]) -> nx.DiGraph:
+    """
+    Build Hasse diagram (refinement lattice) of canonical partitions
+    directly from the covering relation.
+    """
+    indptr, indices = build_hasse_csr(partitions_to_label_array(partitions))
+    return hasse_csr_to_graph(partitions, indptr, indices)
+
+def calculate_delta_cp_lattice(
+    cp: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    block_counts: np.ndarray,
+    return_best_ancestor: bool = False
+):
+    """
+    ΔCP for every partition by dynamic programming over the Hasse diagram.
+    
+    The best CP among strict refinements of p satisfies
+        best[p] = max over lower covers c of max(cp[c], best[c]),
+    so one sweep from the microscale upward (decreasing block count)
+    visits every cover edge once: O(edges).
+    
+    cp: (P,) CP values, or (P, G) for G TPMs over the same lattice
+    indptr, indices: upward covers in CSR form (see build_hasse_csr)
+    block_counts: (P,) number of blocks of each partition
+    return_best_ancestor: also return the index of the refinement achieving
+        best[p] (-1 when p has no strict refinement); 1-D cp only
+    
+    Returns: delta_cp (same shape as cp), and best_ancestor (P,) if requested.
+    Partitions without strict refinements use baseline 0.
+    """
+    cp = np.asarray(cp)
+    if return_best_ancestor and cp.ndim != 1:
+        raise ValueError("return_best_ancestor requires 1-D cp")
+    
+    P = len(cp)
+    best = np.full(cp.shape, -np.inf)
+    best_ancestor = np.full(P, -1, dtype=np.int64)
+    
+    sources = np.repeat(np.arange(P), np.diff(indptr))
+    targets = np.asarray(indices)
+    edge_levels = np.asarray(block_counts)[sources]
+    
+    # Covers of a k-block partition have k - 1 blocks, so each level only
+    # reads values finalized by the previous one
+    for k in np.unique(edge_levels)[::-1]:
+        level = edge_levels == k
+        src, tgt = sources[level], targets[level]
+        values = np.maximum(cp[src], best[src])
+        np.maximum.at(best, tgt, values)
+        
+        if return_best_ancestor:
+            achiever = np.where(cp[src] >= best[src], src, best_ancestor[src])
+            # First edge with the largest value for each target
+            order = np.lexsort((-values, tgt))
+            first_tgt, first_pos = np.unique(tgt[order], return_index=True)
+            best_ancestor[first_tgt] = achiever[order[first_pos]]
+    
+    delta_cp = cp - np.where(np.isfinite(best), best, 0.0)
+    if return_best_ancestor:
+        return delta_cp, best_ancestor
+    return delta_cp
+
+def comembership_bits(labels: np.ndarray) -> np.ndarray:
+    """
+    Pairwise co-membership bitsets of (S, n) label vectors.
+    Bit (i, j), i < j, is set when i and j share a block; packed into
+    (S, W) uint64 words. q refines p exactly when bits(q) ⊆ bits(p).
+    """
+    labels = np.asarray(labels)
+    i, j = np.triu_indices(labels.shape[1], 1)
+    same = labels[:, i] == labels[:, j]
+    packed = np.packbits(same, axis=1, bitorder='little')
+    n_words = max(1, -(-packed.shape[1] // 8))
+    padded = np.zeros((len(labels), n_words * 8), dtype=np.uint8)
+    padded[:, :packed.shape[1]] = packed
+    return padded.view(np.uint64)
+
+class RefinementIndex:
+    """
+    Refinement queries over a fixed set of scored partitions.
+    
+    Partitions are stored as co-membership bitsets sorted by decreasing CP,
+    so "max CP among strict refinements of p" is the first stored partition
+    with more blocks than p whose bitset is a subset of p's. The scan runs
+    in vectorized chunks and stops at the first hit; the microscale (or any
+    fine, high-CP partition) usually ends it within the first chunk.
+    """
+    
+    def __init__(self, cp_dict: Dict[Tuple, float], chunk_size: int = 256):
+        partitions = list(cp_dict.keys())
+        cp = np.array([cp_dict[p] for p in partitions])
+        order = np.argsort(-cp, kind='stable')
+        
+        self.partitions = [partitions[idx] for idx in order]
+        self.cp = cp[order]
+        self.block_counts = np.array([len(p) for p in self.partitions])
+        self.n = sum(len(block) for block in self.partitions[0]) if partitions else 0
+        self.bits = comembership_bits(partitions_to_label_array(self.partitions))
+        self.chunk_size = chunk_size
+    
+    def __len__(self) -> int:
+        return len(self.partitions)
+    
+    def _best_refinement_position(self, partition: Tuple) -> int:
+        """Position of the highest-CP strict refinement of partition, or -1."""
+        bits = comembership_bits(partition_to_labels(partition, self.n)[None])[0]
+        outside = ~bits
+        k = len(partition)
+        
+        for start in range(0, len(self.partitions), self.chunk_size):
+            stop = start + self.chunk_size
+            finer = self.block_counts[start:stop] > k
+            subset = ~(self.bits[start:stop] & outside).any(axis=1)
+            hits = np.flatnonzero(finer & subset)
+            if len(hits):
+                return start + int(hits[0])
+        return -1
+    
+    def best_refinement(self, partition: Tuple) -> Optional[Tuple]:
+        """Indexed strict refinement of partition with the highest CP, or None."""
+        pos = self._best_refinement_position(partition)
+        return self.partitions[pos] if pos >= 0 else None
+    
+    def max_refinement_cp(self, partition: Tuple, default: float = 0.0) -> float:
+        """Max CP among indexed strict refinements of partition (default if none)."""
+        pos = self._best_refinement_position(partition)
+        return float(self.cp[pos]) if pos >= 0 else default
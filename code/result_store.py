@@ -0,0 +1,175 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+Columnar result store: one .npy file per column plus a JSON manifest.
+
+Lattice results (Algorithm 1) become parallel arrays of packed partition
+codes, block counts, CP, determinism, degeneracy and ΔCP; parameter sweeps
+become one row per parameter value. Readers memory-map and load only the
+requested columns, so a plot of summary numbers never unpickles partitions.
+"""
+
+import json
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from ce2_core import (
+    pack_labels,
+    coarse_grain_tpm_batch,
+    calculate_determinism_batch,
+    calculate_degeneracy_batch
+)
+from partition_lattice import partitions_to_label_array
+
+MANIFEST_NAME = "manifest.json"
+STORE_FORMAT = "ce2-columns"
+STORE_VERSION = 1
+
+def _json_value(value):
+    """Convert numpy scalars/arrays and tuples in metadata to JSON types."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (np.ndarray, tuple, list)):
+        return [_json_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _json_value(v) for k, v in value.items()}
+    return value
+
+def save_columns(directory, columns: Dict[str, np.ndarray], metadata: Optional[Dict] = None) -> Path:
+    """
+    Write each column to <directory>/<name>.npy and a manifest describing
+    dtypes and shapes. Returns the directory path.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    
+    manifest = {
+        'format': STORE_FORMAT,
+        'version': STORE_VERSION,
+        'columns': {},
+        'metadata': _json_value(metadata or {})
+    }
+    for name, values in columns.items():
+        values = np.ascontiguousarray(values)
+        np.save(directory / f"{name}.npy", values, allow_pickle=False)
+        manifest['columns'][name] = {
+            'file': f"{name}.npy",
+            'dtype': values.dtype.str,
+            'shape': list(values.shape)
+        }
+    
+    with open(directory / MANIFEST_NAME, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return directory
+
+def read_manifest(directory) -> Dict:
+    """Load the JSON manifest of a column store."""
+    with open(Path(directory) / MANIFEST_NAME) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != STORE_FORMAT:
+        raise ValueError(f"{directory} is not a {STORE_FORMAT} store")
+    return manifest
+
+def is_column_store(path) -> bool:
+    return (Path(path) / MANIFEST_NAME).is_file()
+
+def load_columns(
+    directory,
+    columns: Optional[Sequence[str]] = None,
+    mmap_mode: Optional[str] = 'r'
+) -> Dict[str, np.ndarray]:
+    """
+    Load the requested columns (all if None). With mmap_mode='r' the arrays
+    are memory-mapped, so only the pages actually touched are read.
+    """
+    directory = Path(directory)
+    manifest = read_manifest(directory)
+    names = list(manifest['columns']) if columns is None else list(columns)
+    
+    missing = [name for name in names if name not in manifest['columns']]
+    if missing:
+        raise KeyError(f"columns not in store {directory}: {missing}")
+    
+    return {
+        name: np.load(directory / manifest['columns'][name]['file'], mmap_mode=mmap_mode)
+        for name in names
+    }
+
+def lattice_columns(T: np.ndarray, results: Dict) -> Dict[str, np.ndarray]:
+    """
+    Columns of an Algorithm 1 result: partition codes (uint64, n <= 16;
+    uint8 label rows otherwise), block counts, CP, determinism, degeneracy,
+    ΔCP and an emergent flag, in the order of results['partitions'].
+    """
+    partitions = results['partitions']
+    labels = partitions_to_label_array(partitions)
+    block_counts = labels.max(axis=1).astype(np.uint8) + 1
+    
+    determinism = np.empty(len(partitions))
+    degeneracy = np.empty(len(partitions))
+    for k in np.unique(block_counts):
+        rows = np.flatnonzero(block_counts == k)
+        T_stack = coarse_grain_tpm_batch(T, labels[rows], int(k))
+        determinism[rows] = calculate_determinism_batch(T_stack)
+        degeneracy[rows] = calculate_degeneracy_batch(T_stack)
+    
+    emergent = set(results['emergent'])
+    columns = {
+        'block_count': block_counts,
+        'cp': np.array([results['cp_dict'][p] for p in partitions]),
+        'determinism': determinism,
+        'degeneracy': degeneracy,
+        'delta_cp': np.array([results['delta_cp_dict'][p] for p in partitions]),
+        'emergent': np.array([p in emergent for p in partitions], dtype=bool)
+    }
+    if labels.shape[1] <= 16:
+        columns['code'] = pack_labels(labels)
+    else:
+        columns['labels'] = labels
+    return columns
+
+def save_lattice_results(directory, T: np.ndarray, results: Dict, metadata: Optional[Dict] = None) -> Path:
+    """Save an Algorithm 1 result dict as a column store."""
+    metadata = dict(metadata or {})
+    metadata.setdefault('n', results.get('n', T.shape[0]))
+    metadata.setdefault('kind', 'lattice')
+    return save_columns(directory, lattice_columns(T, results), metadata)
+
+def sweep_columns(all_results: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Columns of a parameter sweep (list of per-point result dicts): every
+    scalar entry becomes a column; emergent partitions are stored ragged as
+    'emergent_code' (uint64, n <= 16; uint8 label rows 'emergent_labels'
+    otherwise) with row offsets 'emergent_offsets'. Matrices (TPMs) are not
+    stored.
+    """
+    columns = {}
+    for name in all_results[0] if all_results else []:
+        values = [r[name] for r in all_results]
+        if all(np.isscalar(v) for v in values):
+            columns[name] = np.array(values)
+    
+    if all_results and 'emergent_partitions' in all_results[0]:
+        offsets = np.zeros(len(all_results) + 1, dtype=np.int64)
+        rows = []
+        for idx, r in enumerate(all_results):
+            rows.extend(r['emergent_partitions'])
+            offsets[idx + 1] = len(rows)
+        labels = partitions_to_label_array(rows) if rows else np.zeros((0, 1), dtype=np.uint8)
+        if labels.shape[1] <= 16:
+            columns['emergent_code'] = pack_labels(labels)
+        else:
+            columns['emergent_labels'] = labels
+        columns['emergent_offsets'] = offsets
+    return columns
+
+def save_sweep_results(directory, all_results: List[Dict], metadata: Optional[Dict] = None) -> Path:
+    """Save a parameter sweep as a column store."""
+    metadata = dict(metadata or {})
+    metadata.setdefault('kind', 'sweep')
+    return save_columns(directory, sweep_columns(all_results), metadata)
@@ -0,0 +1,190 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+Enumeration of the partition lattice one dimensionality at a time
+
+The partitions of n microstates with exactly k blocks (S(n, k) of them,
+Stirling numbers of the second kind) are the restricted growth strings
+whose largest label is k-1. They are generated depth-first over the RGS
+tree, a prefix being extended only while it can still end with between
+k_min and k_max blocks, so a slice [k_min, k_max] costs O(Σ S(n, k)) and
+never touches the other layers.
+
+Near the microscale and the top the slices stay small long after B(n) is
+out of reach (n = 14: B = 190,899,322, but S(14, k) for k >= 11 or k <= 2
+adds up to 77,717), which is where per-dimensionality profiles such as
+visualize_hierarchy.plot_hierarchy_profile are read. A slice reaching the
+microscale (k_max = n) contains every refinement of its partitions, so its
+ΔCP is exact.
+"""
+
+import numpy as np
+from typing import Dict, Iterator, Optional, Tuple
+from ce2_core import (
+    BLOCK_CACHE_MAX_N,
+    block_row_sums,
+    calculate_cp_labels,
+    extend_partition_labels,
+    labels_to_partition
+)
+from compact_partition import CompactPartition
+from lattice_sampler import stirling2_table
+from partition_lattice import build_hasse_csr, calculate_delta_cp_lattice
+
+def slice_size(n: int, k_min: int, k_max: Optional[int] = None) -> int:
+    """Number of partitions of n microstates with k_min..k_max blocks (exact)"""
+    k_max = k_min if k_max is None else k_max
+    S = stirling2_table(n)
+    return sum(S[n][k] for k in range(max(k_min, 0), min(k_max, n) + 1))
+
+def iter_partition_labels_k(
+    n: int,
+    k_min: int,
+    k_max: Optional[int] = None,
+    chunk_size: int = 4096
+) -> Iterator[np.ndarray]:
+    """
+    Yield the partitions of {0, 1, ..., n-1} with k_min..k_max blocks
+    (default exactly k_min) as (m, n) uint8 arrays of restricted growth
+    strings, m <= chunk_size, in RGS order (as iter_partition_labels).
+    """
+    k_max = k_min if k_max is None else k_max
+    k_min, k_max = max(k_min, 1), min(k_max, n)
+    if n < 1 or k_min > k_max:
+        return
+    
+    buffer = np.empty((chunk_size, n), dtype=np.uint8)
+    filled = 0
+    stack = [(np.zeros((1, 1), dtype=np.uint8), np.ones(1, dtype=np.intp))]
+    
+    while stack:
+        labels, n_blocks = stack.pop()
+        if labels.shape[1] < n:
+            labels, n_blocks = extend_partition_labels(labels, n_blocks, n, k_min, k_max)
+        
+        if labels.shape[1] < n:
+            # Push in reverse so the first chunk is extended next
+            for start in reversed(range(0, len(labels), chunk_size)):
+                stack.append((labels[start:start + chunk_size], n_blocks[start:start + chunk_size]))
+            continue
+        
+        # Complete strings: copy into the output buffer
+        while len(labels):
+            take = min(chunk_size - filled, len(labels))
+            buffer[filled:filled + take] = labels[:take]
+            filled += take
+            labels = labels[take:]
+            if filled == chunk_size:
+                yield buffer.copy()
+                filled = 0
+    
+    if filled:
+        yield buffer[:filled].copy()
+
+def iter_cp_slice(
+    T: np.ndarray,
+    k_min: int,
+    k_max: Optional[int] = None,
+    chunk_size: int = 4096,
+    block_cache: bool = False
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Stream (labels, cp) over the partitions of the microstates of T with
+    k_min..k_max blocks (see iter_partition_labels_k).
+    block_cache: coarse-grain from the summed micro rows of every block
+        (ce2_core.block_row_sums, 2^n rows, n <= BLOCK_CACHE_MAX_N); pays
+        off for large slices only (n = 20: ~168 MB)
+    """
+    T = np.asarray(T, dtype=float)
+    n = T.shape[0]
+    if block_cache and n > BLOCK_CACHE_MAX_N:
+        raise ValueError(f"block_cache supports n <= {BLOCK_CACHE_MAX_N}, got n={n}")
+    block_rows = block_row_sums(T) if block_cache else None
+    for labels in iter_partition_labels_k(n, k_min, k_max, chunk_size):
+        yield labels, calculate_cp_labels(T, labels, block_rows)
+
+def calculate_cp_slice(
+    T: np.ndarray,
+    k_min: int,
+    k_max: Optional[int] = None,
+    chunk_size: int = 4096,
+    block_cache: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    CP of every partition of the microstates of T with k_min..k_max blocks
+    (block_cache as in iter_cp_slice).
+    Returns: (P, n) restricted growth strings and (P,) CP values, RGS order
+    """
+    n = T.shape[0]
+    chunks = list(iter_cp_slice(T, k_min, k_max, chunk_size, block_cache))
+    if not chunks:
+        return np.zeros((0, n), dtype=np.uint8), np.zeros(0)
+    return np.concatenate([c[0] for c in chunks]), np.concatenate([c[1] for c in chunks])
+
+def run_slice_algorithm1(
+    T: np.ndarray,
+    k_min: int,
+    k_max: Optional[int] = None,
+    epsilon: float = 1e-10,
+    compact: bool = False,
+    block_cache: bool = False,
+    verbose: bool = True
+) -> Dict:
+    """
+    Algorithm 1 restricted to the partitions with k_min..k_max blocks
+    (default k_max = n, i.e. every dimensionality from k_min to the microscale).
+    
+    ΔCP compares each partition with its best strict refinement inside the
+    slice. It is exact when the slice reaches the microscale (k_max = n);
+    otherwise refinements with more than k_max blocks are missed, ΔCP may be
+    overestimated and delta_cp_exact is False. Covers are looked up by
+    packed code (n <= 16).
+    
+    compact: key results by CompactPartition instead of tuple-of-tuples
+        partitions (much faster for large slices; len() is the block count
+        either way, so the visualize_hierarchy profiles accept both)
+    block_cache: score from cached block rows (see iter_cp_slice)
+    
+    Returns dict with partitions, cp_dict, delta_cp_dict, emergent
+    (ΔCP > epsilon), k_min, k_max, delta_cp_exact, n_partitions, n
+    """
+    T = np.asarray(T, dtype=float)
+    n = T.shape[0]
+    k_max = n if k_max is None else min(k_max, n)
+    
+    if verbose:
+        print(f"Starting Algorithm 1 for n={n} states, {k_min}..{k_max} blocks...")
+        print(f"  {slice_size(n, k_min, k_max)} partitions in the slice")
+    
+    # Step 1-2: Enumerate and score the slice
+    labels, cp_values = calculate_cp_slice(T, k_min, k_max, block_cache=block_cache)
+    block_counts = labels.max(axis=1).astype(np.intp) + 1 if len(labels) else np.zeros(0, dtype=np.intp)
+    
+    # Step 3-4: Covers within the slice and ΔCP
+    indptr, indices = build_hasse_csr(labels)
+    delta_cp = calculate_delta_cp_lattice(cp_values, indptr, indices, block_counts)
+    
+    if compact:
+        partitions = [CompactPartition(row.tobytes()) for row in labels]
+    else:
+        partitions = [labels_to_partition(row) for row in labels]
+    emergent = [p for p, d in zip(partitions, delta_cp.tolist()) if d > epsilon]
+    if verbose:
+        print(f"  Found {len(emergent)} emergent scales (ΔCP > {epsilon})")
+    
+    return {
+        'partitions': partitions,
+        'cp_dict': dict(zip(partitions, cp_values.tolist())),
+        'delta_cp_dict': dict(zip(partitions, delta_cp.tolist())),
+        'emergent': emergent,
+        'k_min': k_min,
+        'k_max': k_max,
+        'delta_cp_exact': k_max == n,
+        'n_partitions': len(partitions),
+        'n': n
+    }
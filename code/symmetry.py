@@ -0,0 +1,285 @@
+"""
+Verification of Engineering Emergence (Jansma & Hoel, 2025)
+
+Author: Oleksii Onasenko
+Developer: SubstanceNet
+"""
+
+"""
+TPM automorphisms and orbit-reduced Algorithm 1.
+
+A permutation σ of the microstates with T[σ][:, σ] = T maps every partition
+to one with the same macro TPM up to relabelling, so CP, ΔCP and emergence
+are constant on the orbits of the automorphism group. For the two-cycle
+systems (rotations within each cycle, swapping the cycles) the group has
+2·c² elements and most orbits are that large.
+
+Each orbit is represented by its canonical member, the image with the
+smallest packed code (ce2_core.pack_labels, n <= 16). Representatives are
+generated directly, level by level from the microscale, by merging two
+blocks of the representatives one level finer and canonicalizing, so
+neither enumeration nor scoring touches the other B(n) partitions. The
+same merges give the quotient covers (representatives whose orbits contain
+a covering pair), on which ΔCP follows from the lattice DP. Results are
+expanded back to every partition on demand (expand_symmetric_results).
+"""
+
+import numpy as np
+from typing import Dict, Iterator, Optional, Tuple
+from ce2_core import (
+    calculate_cp_labels,
+    labels_to_partition,
+    pack_labels,
+    unpack_labels
+)
+from partition_lattice import merge_labels, calculate_delta_cp_lattice
+
+def tpm_automorphisms(T: np.ndarray, atol: float = 1e-12, max_order: int = 100_000) -> np.ndarray:
+    """
+    All state permutations σ with T[σ][:, σ] = T (within atol), by
+    backtracking over states with matching diagonal, row and column profiles.
+    Returns: (|G|, n) permutations, identity first
+    Raises ValueError when the group has more than max_order elements
+    (e.g. a uniform TPM, whose group is all n! permutations).
+    """
+    T = np.asarray(T, dtype=float)
+    n = T.shape[0]
+    decimals = max(0, int(-np.log10(atol)) - 1)
+    profile = [
+        (round(T[i, i], decimals),
+         tuple(np.round(np.sort(T[i]), decimals)),
+         tuple(np.round(np.sort(T[:, i]), decimals)))
+        for i in range(n)
+    ]
+    candidates = [[j for j in range(n) if profile[j] == profile[i]] for i in range(n)]
+    
+    group = []
+    sigma = np.empty(n, dtype=np.intp)
+    used = np.zeros(n, dtype=bool)
+    
+    def extend(i):
+        if i == n:
+            group.append(sigma.copy())
+            if len(group) > max_order:
+                raise ValueError(f"automorphism group has more than {max_order} elements")
+            return
+        for j in candidates[i]:
+            if used[j]:
+                continue
+            sigma[i] = j
+            # Entries between i and the states already placed
+            if not (np.allclose(T[i, :i + 1], T[j, sigma[:i + 1]], rtol=0.0, atol=atol)
+                    and np.allclose(T[:i + 1, i], T[sigma[:i + 1], j], rtol=0.0, atol=atol)):
+                continue
+            used[j] = True
+            extend(i + 1)
+            used[j] = False
+    
+    extend(0)
+    group = np.array(group, dtype=np.intp).reshape(-1, n)
+    identity = np.flatnonzero((group == np.arange(n)).all(axis=1))[0]
+    return np.concatenate([group[identity:identity + 1], np.delete(group, identity, axis=0)])
+
+def renumber_labels(labels: np.ndarray) -> np.ndarray:
+    """
+    Renumber (B, n) label vectors by first occurrence, giving restricted
+    growth strings (vectorized CompactPartition.from_labels).
+    """
+    labels = np.asarray(labels)
+    B, n = labels.shape
+    rows = np.arange(B)
+    mapping = np.full((B, n), -1, dtype=np.int16)
+    count = np.zeros(B, dtype=np.int16)
+    out = np.empty((B, n), dtype=np.uint8)
+    
+    for i in range(n):
+        value = labels[:, i]
+        label = mapping[rows, value]
+        new = label < 0
+        label = np.where(new, count, label)
+        mapping[rows[new], value[new]] = count[new]
+        count += new
+        out[:, i] = label
+    
+    return out
+
+def permute_partitions(labels: np.ndarray, sigma: np.ndarray) -> np.ndarray:
+    """
+    Images of (B, n) restricted growth strings under the state permutation
+    σ (microstate σ(i) takes the block of i), as restricted growth strings.
+    """
+    inverse = np.argsort(sigma)
+    return renumber_labels(np.asarray(labels)[:, inverse])
+
+def canonical_codes(labels: np.ndarray, group: np.ndarray) -> np.ndarray:
+    """
+    Packed code of the canonical member (smallest code) of the orbit of
+    each of the (B, n) restricted growth strings.
+    Returns: (B,) uint64
+    """
+    codes = pack_labels(labels)
+    for sigma in group[1:]:
+        codes = np.minimum(codes, pack_labels(permute_partitions(labels, sigma)))
+    return codes
+
+def orbit_sizes(labels: np.ndarray, group: np.ndarray) -> np.ndarray:
+    """Orbit size |G| / |stabilizer| of each of the (B, n) restricted growth strings."""
+    codes = pack_labels(labels)
+    stabilizer = np.zeros(len(labels), dtype=np.int64)
+    for sigma in group:
+        stabilizer += pack_labels(permute_partitions(labels, sigma)) == codes
+    return len(group) // stabilizer
+
+def orbit_quotient(n: int, group: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Canonical members of all orbits and the quotient covers between them,
+    generated level by level from the microscale without enumerating the
+    B(n) partitions: the orbits with k-1 blocks are the canonical forms of
+    all block merges of the representatives with k blocks (every partition
+    is a merge of a finer one, and automorphisms map merges to merges).
+    Returns: (R, n) uint8 representatives in RGS order and the CSR upward
+    covers (indptr, indices) between them
+    """
+    level = np.arange(n, dtype=np.uint8)[None]
+    levels = [level]
+    source_codes, target_codes = [], []
+    
+    for k in range(n, 1, -1):
+        a, b = np.triu_indices(k, 1)
+        children = merge_labels(level[:, None, :], a[None, :, None], b[None, :, None])
+        child_codes, inverse = np.unique(pack_labels(children).ravel(), return_inverse=True)
+        canonical = canonical_codes(unpack_labels(child_codes, n), group)
+        next_codes, target = np.unique(canonical, return_inverse=True)
+        source_codes.append(np.repeat(pack_labels(level), len(a)))
+        target_codes.append(next_codes[target[inverse.ravel()]])
+        level = unpack_labels(next_codes, n)
+        levels.append(level)
+    
+    labels = np.concatenate(levels)
+    labels = labels[np.lexsort(labels.T[::-1])]
+    codes = pack_labels(labels)
+    order = np.argsort(codes)
+    index = lambda c: order[np.searchsorted(codes, c, sorter=order)]
+    
+    # Deduplicate, then CSR by source
+    if source_codes:
+        edges = np.unique(np.stack([index(np.concatenate(source_codes)),
+                                    index(np.concatenate(target_codes))], axis=1), axis=0)
+    else:
+        edges = np.zeros((0, 2), dtype=np.intp)
+    indptr = np.zeros(len(labels) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edges[:, 0], minlength=len(labels)), out=indptr[1:])
+    return labels, indptr, edges[:, 1].astype(np.int64)
+
+def iter_orbit_representatives(n: int, group: np.ndarray, chunk_size: int = 65536) -> Iterator[np.ndarray]:
+    """
+    Yield the canonical member of every orbit, in RGS order, as (m, n)
+    uint8 chunks (generated by orbit_quotient, not by filtering all B(n)
+    partitions).
+    """
+    labels = orbit_quotient(n, group)[0]
+    for start in range(0, len(labels), chunk_size):
+        yield labels[start:start + chunk_size]
+
+def expand_orbit(labels: np.ndarray, group: np.ndarray) -> np.ndarray:
+    """All members of the orbit of one restricted growth string, in RGS order."""
+    labels = np.asarray(labels, dtype=np.uint8)[None]
+    images = np.concatenate([permute_partitions(labels, sigma) for sigma in group])
+    return np.unique(images, axis=0)
+
+def run_symmetric_algorithm1(
+    T: np.ndarray,
+    epsilon: float = 1e-10,
+    group: Optional[np.ndarray] = None,
+    verbose: bool = True
+) -> Dict:
+    """
+    Algorithm 1 over one representative per orbit of the automorphism group.
+    
+    group: (|G|, n) automorphisms, identity first (default tpm_automorphisms(T))
+    
+    Returns dict with:
+        - partitions: orbit representatives (canonical members)
+        - orbit_size: number of partitions in each representative's orbit
+        - cp_dict, delta_cp_dict: values of the representatives
+        - emergent: representatives with ΔCP > epsilon
+        - group, n_partitions (B(n)), n
+    Use expand_symmetric_results for the run_algorithm1 view over all partitions.
+    """
+    n = T.shape[0]
+    if group is None:
+        group = tpm_automorphisms(T)
+    
+    if verbose:
+        print(f"Starting symmetric Algorithm 1 for n={n} states...")
+        print(f"  Automorphism group of order {len(group)}")
+    
+    # Step 1: Orbit representatives and quotient covers, level by level
+    labels, indptr, indices = orbit_quotient(n, group)
+    sizes = orbit_sizes(labels, group)
+    block_counts = labels.max(axis=1).astype(np.intp) + 1
+    if verbose:
+        print(f"  {len(labels)} orbits cover {int(sizes.sum())} partitions")
+    
+    # Step 2: CP of the representatives
+    cp_values = calculate_cp_labels(T, labels)
+    
+    # Step 3: ΔCP on the quotient lattice
+    delta_cp = calculate_delta_cp_lattice(cp_values, indptr, indices, block_counts)
+    
+    partitions = [labels_to_partition(row) for row in labels]
+    emergent = [p for p, d in zip(partitions, delta_cp.tolist()) if d > epsilon]
+    if verbose:
+        print(f"  Found {len(emergent)} emergent orbits "
+              f"({int(sizes[delta_cp > epsilon].sum())} emergent scales, ΔCP > {epsilon})")
+    
+    return {
+        'partitions': partitions,
+        'orbit_size': dict(zip(partitions, sizes.tolist())),
+        'cp_dict': dict(zip(partitions, cp_values.tolist())),
+        'delta_cp_dict': dict(zip(partitions, delta_cp.tolist())),
+        'emergent': emergent,
+        'group': group,
+        'n_partitions': int(sizes.sum()),
+        'n': n
+    }
+
+def expand_symmetric_results(results: Dict) -> Dict:
+    """
+    Expand run_symmetric_algorithm1 results to every partition, with the
+    run_algorithm1 keys (partitions in sorted order; no graph).
+    """
+    n = results['n']
+    group = results['group']
+    reps = results['partitions']
+    rep_labels = np.zeros((len(reps), n), dtype=np.uint8)
+    for row, rep in enumerate(reps):
+        for label, block in enumerate(rep):
+            rep_labels[row, list(block)] = label
+    
+    # Every image of every representative, then one row per member
+    images = np.concatenate([permute_partitions(rep_labels, sigma) for sigma in group])
+    owner = np.tile(np.arange(len(reps)), len(group))
+    members, first = np.unique(pack_labels(images), return_index=True)
+    member_labels = images[first]
+    member_owner = owner[first]
+    
+    rep_cp = np.array([results['cp_dict'][rep] for rep in reps])
+    rep_delta = np.array([results['delta_cp_dict'][rep] for rep in reps])
+    emergent_reps = set(results['emergent'])
+    rep_emergent = np.array([rep in emergent_reps for rep in reps])
+    
+    member_partitions = [labels_to_partition(row) for row in member_labels]
+    cp_dict = dict(zip(member_partitions, rep_cp[member_owner].tolist()))
+    delta_cp_dict = dict(zip(member_partitions, rep_delta[member_owner].tolist()))
+    partitions = sorted(cp_dict)
+    emergent = sorted(p for p, e in zip(member_partitions, rep_emergent[member_owner]) if e)
+    
+    return {
+        'partitions': partitions,
+        'cp_dict': cp_dict,
+        'delta_cp_dict': delta_cp_dict,
+        'emergent': emergent,
+        'graph': None,
+        'n': n
+    }
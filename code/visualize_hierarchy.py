@@ -69,6 +69,8 @@ def plot_hierarchy_profile(results, output_path):
 def plot_cp_distribution(results, output_path):
     """
     Plot CP values for all partitions grouped by dimensionality
+    (for greedy results this shows the sampled set, which is biased
+    toward high CP; see plot_sampled_cp_profile)
     """
     fig, ax = plt.subplots(figsize=(10, 6))
     
@@ -100,6 +102,45 @@ def plot_cp_distribution(results, output_path):
     print(f"Saved CP distribution: {output_path}")
     plt.close()
 
+def plot_sampled_cp_profile(sampled, output_path):
+    """
+    Plot CP across dimensionalities estimated from uniform random partitions
+    (see lattice_sampler.sample_cp_profile), with confidence intervals
+    """
+    profile = sampled['profile']
+    dims = sorted(profile.keys())
+    mean_cp = np.array([profile[d]['mean_cp'] for d in dims])
+    mean_ci = np.array([profile[d]['mean_ci'] for d in dims])
+    frac = np.array([profile[d]['frac_above_micro'] for d in dims])
+    frac_ci = np.array([profile[d]['frac_above_micro_ci'] for d in dims])
+    level = int(round(sampled['confidence'] * 100))
+    
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    
+    # Mean CP
+    ax1.errorbar(dims, mean_cp, yerr=[mean_cp - mean_ci[:, 0], mean_ci[:, 1] - mean_cp],
+                 fmt='o-', color='blue', capsize=3, linewidth=2, markersize=6)
+    ax1.axhline(sampled['cp_micro'], color='red', linestyle='--', label='CP(microscale)')
+    ax1.set_xlabel('Dimensionality', fontsize=12)
+    ax1.set_ylabel('Mean CP', fontsize=12)
+    ax1.set_title(f'Sampled CP Profile (n={sampled["n"]}, {level}% CI)', fontsize=12, fontweight='bold')
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+    
+    # Share of partitions that beat the microscale (candidate emergent scales)
+    frac_err = np.clip([frac - frac_ci[:, 0], frac_ci[:, 1] - frac], 0.0, None)
+    ax2.errorbar(dims, frac, yerr=frac_err,
+                 fmt='s-', color='green', capsize=3, linewidth=2, markersize=6)
+    ax2.set_xlabel('Dimensionality', fontsize=12)
+    ax2.set_ylabel('Fraction with CP > CP(micro)', fontsize=12)
+    ax2.set_title('Candidate Emergent Partitions', fontsize=12, fontweight='bold')
+    ax2.grid(True, alpha=0.3)
+    
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    print(f"Saved sampled CP profile: {output_path}")
+    plt.close()
+
 def plot_top_partitions(results, output_path):
     """
     Plot top 10 partitions by ΔCP
@@ -109,6 +109,148 @@ assert cp == 1.0, f'CP should be 1.0 for permutation, got {cp}'
 print('  [OK] Core functions work correctly')
 " || exit 1
 
+echo ""
+echo "======================================================================"
+echo "ТЕСТ 5: Branch-and-bound проти повного перебору"
+echo "======================================================================"
+echo ""
+
+echo "Тест branch_and_bound.py..."
+python3 -c "
+import sys
+sys.path.insert(0, 'code')
+import numpy as np
+from ce2_core import iter_partition_labels, calculate_cp_labels
+from partition_lattice import build_hasse_csr, calculate_delta_cp_lattice
+from branch_and_bound import top_k_cp, top_k_delta_cp
+
+rng = np.random.default_rng(0)
+for trial in range(60):
+    n = int(rng.integers(3, 8))
+    T = rng.random((n, n)) ** 4
+    T /= T.sum(axis=1, keepdims=True)
+    labels = np.concatenate(list(iter_partition_labels(n)))
+    blocks = labels.max(axis=1) + 1
+    cp = calculate_cp_labels(T, labels)
+    indptr, indices = build_hasse_csr(labels)
+    delta = calculate_delta_cp_lattice(cp, indptr, indices, blocks)
+    macro = (blocks >= 2) & (blocks < n)
+    
+    expected = np.sort(cp[macro])[::-1][:3]
+    found = [c for _, c in top_k_cp(T, K=3)['top']]
+    assert np.allclose(found, expected, atol=1e-10), (trial, found, expected)
+    
+    emergent = np.sort(delta[macro & (delta > 1e-10)])[::-1][:3]
+    found = [d for _, d, _ in top_k_delta_cp(T, K=3)['top']]
+    assert np.allclose(found, emergent, atol=1e-10), (trial, found, emergent)
+print('  [OK] top_k_cp / top_k_delta_cp = brute force (60 random TPMs, n = 3-7)')
+" || exit 1
+
+echo ""
+echo "======================================================================"
+echo "ТЕСТ 6: Інкрементальна оцінка злиттів блоків"
+echo "======================================================================"
+echo ""
+
+echo "Тест calculate_merge_cp / merge_macro_tpm..."
+python3 -c "
+import sys
+sys.path.insert(0, 'code')
+import numpy as np
+from itertools import combinations
+from ce2_core import (calculate_cp, coarse_grain_tpm, block_weights, calculate_merge_cp,
+                      merge_macro_tpm, merge_partition_blocks, iter_partitions)
+
+rng = np.random.default_rng(0)
+for trial in range(20):
+    n = int(rng.integers(3, 8))
+    T = rng.random((n, n)) ** 4
+    T /= T.sum(axis=1, keepdims=True)
+    partitions = [p for p in iter_partitions(n) if len(p) > 1]
+    for idx in rng.choice(len(partitions), size=min(5, len(partitions)), replace=False):
+        partition = partitions[idx]
+        T_macro = coarse_grain_tpm(T, partition)
+        weights = block_weights(T, partition)
+        merge_cps = calculate_merge_cp(T_macro, weights)
+        for (i, j), cp in zip(combinations(range(len(partition)), 2), merge_cps):
+            merged = merge_partition_blocks(partition, i, j)
+            assert abs(cp - calculate_cp(coarse_grain_tpm(T, merged))) < 1e-10, (trial, partition, i, j)
+            T_merged, w_merged = merge_macro_tpm(T_macro, weights, i, j)
+            assert np.allclose(T_merged, coarse_grain_tpm(T, merged), atol=1e-12)
+            assert np.allclose(w_merged, block_weights(T, merged), atol=1e-12)
+print('  [OK] calculate_merge_cp / merge_macro_tpm = direct coarse-graining (20 random TPMs, n = 3-7)')
+" || exit 1
+
+echo ""
+echo "======================================================================"
+echo "ТЕСТ 7: Інкрементальна оцінка CP за префіксами"
+echo "======================================================================"
+echo ""
+
+echo "Тест incremental_cp.py..."
+python3 -c "
+import sys
+sys.path.insert(0, 'code')
+import numpy as np
+from ce2_core import iter_partition_labels, calculate_cp_labels
+from incremental_cp import calculate_cp_incremental, calculate_cp_labels_incremental
+
+rng = np.random.default_rng(0)
+for trial in range(20):
+    n = int(rng.integers(1, 10))
+    T = rng.random((n, n)) ** 4
+    T /= T.sum(axis=1, keepdims=True)
+    labels = np.concatenate(list(iter_partition_labels(n)))
+    expected = calculate_cp_labels(T, labels)
+    
+    stream_labels, stream_cp = calculate_cp_incremental(T, chunk_size=int(rng.integers(1, 500)))
+    assert np.array_equal(stream_labels, labels), trial
+    assert np.allclose(stream_cp, expected, atol=1e-10), trial
+    
+    shuffled = rng.permutation(len(labels))
+    assert np.allclose(calculate_cp_labels_incremental(T, labels[shuffled]), expected[shuffled], atol=1e-10), trial
+print('  [OK] calculate_cp_incremental = calculate_cp_labels, same RGS order (20 random TPMs, n = 1-9)')
+" || exit 1
+
+echo ""
+echo "======================================================================"
+echo "ТЕСТ 8: Порядок уточнення і ΔCP Алгоритму 1"
+echo "======================================================================"
+echo ""
+
+echo "Тест is_refinement / run_algorithm1..."
+python3 -c "
+import sys, os, io, tempfile, contextlib
+sys.path.insert(0, 'code')
+os.environ['CE2_LATTICE_CACHE'] = tempfile.mkdtemp()
+import numpy as np
+import networkx as nx
+from ce2_core import generate_all_partitions
+from partition_lattice import build_hasse_diagram
+from algorithm1_brute_force import is_refinement, run_algorithm1
+
+partitions = generate_all_partitions(5)
+G = build_hasse_diagram(partitions)
+refinements = {p: [q for q in partitions if q != p and is_refinement(q, p)] for p in partitions}
+for p in partitions:
+    assert set(nx.ancestors(G, p)) == set(refinements[p]), p
+print('  [OK] is_refinement = Hasse ancestors (n = 5, 52 partitions)')
+
+rng = np.random.default_rng(0)
+for trial in range(10):
+    T = rng.random((5, 5)) ** 4
+    T /= T.sum(axis=1, keepdims=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        graph_mode = run_algorithm1(T)
+        lattice_mode = run_algorithm1(T, use_lattice_cache=True, build_graph=False, incremental=True)
+    cp = graph_mode['cp_dict']
+    expected = {p: cp[p] - max([0.0] + [cp[q] for q in refinements[p]]) for p in partitions}
+    for results in (graph_mode, lattice_mode):
+        for p in partitions:
+            assert abs(results['delta_cp_dict'][p] - expected[p]) < 1e-10, (trial, p)
+print('  [OK] run_algorithm1 ΔCP = CP minus best strict refinement (10 random TPMs, n = 5)')
+" || exit 1
+
 echo ""
 echo "======================================================================"
 echo "ВСІ БАЗОВІ ТЕСТИ ПРОЙДЕНО!"